@@ -5,38 +5,112 @@ Allows users to execute MDC automation files via natural language prompts
 
 import streamlit as st
 import subprocess
+import shutil
+import functools
+import logging
 import json
 import os
 import time
 import re
+import zlib
+import hashlib
 from pathlib import Path
-import asyncio
-from typing import Dict, List, Optional
-from openai import OpenAI
-import requests
-from datetime import datetime, timedelta
+import threading
+import queue
+import select
+import tempfile
+import signal
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import IO, Dict, List, Optional, Tuple, Union
+from datetime import datetime
+
+try:
+    import orjson  # Optional: faster JSON for the MDC cache file, worker replies and LLM responses
+except ImportError:
+    orjson = None
+
+# App logger; level from MDC_LOG_LEVEL (default INFO), so debug diagnostics cost nothing in production
+log = logging.getLogger("mdc")
+log.setLevel(os.getenv("MDC_LOG_LEVEL", "INFO").upper())
+if not log.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [mdc] %(message)s"))
+    log.addHandler(_log_handler)
+    log.propagate = False
+
+# App root and default MDC directory, computed once per process
+_HERE = Path(__file__).resolve().parent
+_DEFAULT_MDC_DIR = _HERE / "mdc_files"
+
+# Number of recently used MDC files shown with full details in the sidebar
+RECENT_MDC_LIMIT = 5
+
+# Max executions kept in session history (oldest are dropped)
+EXECUTION_HISTORY_LIMIT = 200
+
+# Node.js binary on PATH (None if missing), resolved once per process
+NODE_BIN = shutil.which('node')
+
+# Node executor script, checked once instead of on every execution
+_EXECUTOR_JS = _HERE / 'mdc_executor.js'
+_EXECUTOR_EXISTS = _EXECUTOR_JS.exists()
+
+# Written once Playwright's browser install has been verified
+_PLAYWRIGHT_MARKER = _HERE / '.playwright_installed'
+
+# Written after a verified npm install; holds the fingerprint of the tree it verified
+_NPM_SENTINEL = _HERE / '.mdc_npm_ok'
+
+# Running on Streamlit Cloud (no X server; browser must be headless)
+_IS_CLOUD = os.getenv('STREAMLIT_RUNTIME_ENV') == 'cloud' or os.path.exists('/mount/src')
+
+# Executor command; on cloud it is wrapped with xvfb-run to provide an X server
+if _IS_CLOUD:
+    _EXEC_CMD = ("xvfb-run", "--auto-servernum", "--server-args=-screen 0 1920x1080x24",
+                 "node", "mdc_executor.js")
+else:
+    _EXEC_CMD = ("node", "mdc_executor.js")
 
 # ============================================================================
 # NPM INSTALL CHECK - Install MCP SDK if not present
 # ============================================================================
+def _xvfb_running() -> bool:
+    """
+    Check for a running Xvfb without forking pgrep.
+    Xvfb creates /tmp/.X99-lock for display :99; otherwise scan /proc/*/comm.
+    """
+    if os.path.exists('/tmp/.X99-lock'):
+        return True
+    try:
+        pids = [pid for pid in os.listdir('/proc') if pid.isdigit()]
+    except OSError:
+        return False
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/comm') as f:
+                if f.read().strip() == 'Xvfb':
+                    return True
+        except OSError:
+            continue
+    return False
+
 def setup_virtual_display():
     """
     Setup virtual display for browser automation on Streamlit Cloud.
     This is lightweight and safe to run at import time.
     """
-    # Check if running on Streamlit Cloud
-    is_cloud = os.getenv('STREAMLIT_RUNTIME_ENV') == 'cloud' or os.path.exists('/mount/src')
-    
     # Setup virtual display for browser automation (Streamlit Cloud has no X server)
-    if is_cloud:
+    if _IS_CLOUD:
         # Set DISPLAY environment variable for all subprocesses
         os.environ['DISPLAY'] = ':99'
         
         # Start Xvfb in background if not already running
         try:
-            # Check if Xvfb is already running
-            check_xvfb = subprocess.run(['pgrep', 'Xvfb'], capture_output=True, timeout=5)
-            if check_xvfb.returncode != 0:
+            if not _xvfb_running():
                 # Start Xvfb in background
                 subprocess.Popen(
                     ['Xvfb', ':99', '-screen', '0', '1920x1080x24', '-nolisten', 'tcp'],
@@ -47,25 +121,338 @@ def setup_virtual_display():
         except Exception:
             pass  # Xvfb might already be running or not needed
 
+def _npm_tree_fingerprint() -> Optional[str]:
+    """
+    Fingerprint of the installed npm tree (package-lock.json and node_modules mtimes).
+    Returns None if either is missing.
+    """
+    try:
+        lock = (_HERE / 'package-lock.json').stat()
+        modules = (_HERE / 'node_modules').stat()
+    except OSError:
+        return None
+    return f"{lock.st_mtime_ns}:{lock.st_size}:{modules.st_mtime_ns}"
+
+def _npm_sentinel_valid() -> bool:
+    """True if the sentinel was written for the npm tree that is on disk now."""
+    try:
+        recorded = _NPM_SENTINEL.read_text().strip()
+    except OSError:
+        return False
+    return bool(recorded) and recorded == _npm_tree_fingerprint()
+
+def _clear_npm_sentinel():
+    """Drop the npm sentinel so the next check falls back to the real node_modules stat."""
+    try:
+        _NPM_SENTINEL.unlink()
+    except FileNotFoundError:
+        pass
+    check_dependencies.cache_clear()
+
+@functools.lru_cache(maxsize=1)
 def check_dependencies():
     """
     Quick check if dependencies are installed. Non-blocking.
-    Returns status dict.
+    Memoized; call check_dependencies.cache_clear() after changing a marker.
+    Returns status dict (shared, do not mutate).
     """
-    node_modules_path = Path(__file__).parent / 'node_modules'
-    mcp_sdk_path = node_modules_path / '@modelcontextprotocol' / 'sdk'
-    playwright_marker = Path(__file__).parent / '.playwright_installed'
+    playwright_marker = _PLAYWRIGHT_MARKER
+    
+    # A sentinel matching the current tree skips the deep node_modules stat;
+    # a missing or changed tree falls back to the real check
+    if _npm_sentinel_valid():
+        npm_installed = True
+    else:
+        mcp_sdk_path = _HERE / 'node_modules' / '@modelcontextprotocol' / 'sdk'
+        npm_installed = mcp_sdk_path.exists()
     
     return {
-        'npm_packages': mcp_sdk_path.exists(),
+        'npm_packages': npm_installed,
         'playwright': playwright_marker.exists(),
         'display': os.getenv('DISPLAY') is not None
     }
 
+def _count_entries(path) -> int:
+    """Count direct children of a directory with a single scandir."""
+    with os.scandir(path) as it:
+        return sum(1 for _ in it)
+
+def _dir_size(path) -> int:
+    """
+    Total size of regular files under path.
+    Iterative scandir walk; DirEntry type info comes from readdir, so only files get a stat.
+    """
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+def _node_modules_stats(node_modules_path: Path):
+    """
+    Return (package count, total bytes) for node_modules.
+    Cached in node_modules/.size_cache keyed on the lockfile mtime so reinstalls of
+    the same tree skip the walk.
+    """
+    lockfile = node_modules_path / '.package-lock.json'
+    if not lockfile.exists():
+        lockfile = _HERE / 'package.json'
+    lock_mtime = lockfile.stat().st_mtime_ns
+    size_cache = node_modules_path / '.size_cache'
+    
+    try:
+        cached = json.loads(size_cache.read_text())
+        if cached.get('lockfile_mtime') == lock_mtime:
+            return cached['count'], cached['size']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    count = _count_entries(node_modules_path)
+    size = _dir_size(node_modules_path)
+    try:
+        size_cache.write_text(json.dumps({'lockfile_mtime': lock_mtime, 'size': size, 'count': count}))
+    except OSError:
+        pass
+    return count, size
+
+def _npm_install_command() -> List[str]:
+    """
+    npm command for a production install.
+    Uses `npm ci` (no dependency resolution, installs straight from the lockfile) when
+    package-lock.json exists; MDC_NPM_CACHE points npm at a cache dir that survives restarts.
+    """
+    if (_HERE / 'package-lock.json').exists():
+        cmd = ['npm', 'ci']
+    else:
+        cmd = ['npm', 'install']
+    cmd += ['--omit=dev', '--prefer-offline', '--no-audit', '--no-fund', '--loglevel=error']
+    npm_cache = os.getenv('MDC_NPM_CACHE')
+    if npm_cache:
+        cmd += ['--cache', npm_cache]
+    return cmd
+
+def _install_npm(node_modules_path: Path, mcp_sdk_path: Path, playwright_ready: threading.Event) -> Dict:
+    """
+    Run the npm install. Sets playwright_ready as soon as playwright-core is
+    unpacked so the browser download can start while npm finishes.
+    Returns dict with success, message, detail and logs.
+    """
+    logs = []
+    playwright_cli = node_modules_path / 'playwright-core' / 'cli.js'
+    
+    # The tree is about to change; a failed install must not leave "installed" behind
+    _clear_npm_sentinel()
+    
+    logs.append("📦 Installing npm packages...")
+    logs.append(f"   Working directory: {_HERE}")
+    npm_cmd = _npm_install_command()
+    logs.append(f"   Command: {' '.join(npm_cmd)}")
+    logs.append(f"   Started at: {datetime.now().strftime('%H:%M:%S')}")
+    
+    # `npm ci` wipes node_modules first, so a leftover playwright-core must not trigger an early start
+    early_start = npm_cmd[1] != 'ci' or not playwright_cli.exists()
+    
+    try:
+        start_time = time.time()
+        proc = subprocess.Popen(
+            npm_cmd,
+            cwd=_HERE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        # Poll for playwright-core while npm runs; communicate() can be retried without losing output
+        while True:
+            try:
+                stdout, stderr = proc.communicate(timeout=0.5)
+                break
+            except subprocess.TimeoutExpired:
+                if early_start and not playwright_ready.is_set() and playwright_cli.exists():
+                    playwright_ready.set()
+                if time.time() - start_time > 300:  # 5 minute timeout
+                    proc.kill()
+                    proc.communicate()
+                    raise
+        elapsed = time.time() - start_time
+        
+        logs.append(f"   Completed in {elapsed:.1f} seconds")
+        logs.append(f"   Return code: {proc.returncode}")
+        
+        # Show npm output (abbreviated)
+        if stdout:
+            stdout_lines = stdout.strip().split('\n')
+            logs.append(f"   Output: {stdout_lines[-1] if stdout_lines else 'none'}")  # Last line
+        
+        if proc.returncode != 0:
+            logs.append(f"❌ npm install failed with return code {proc.returncode}")
+            if stderr:
+                logs.append(f"   Error: {stderr[:300]}")
+            return {'success': False, 'message': 'npm install failed', 'detail': None, 'logs': logs}
+        
+        # Verify installation
+        if not mcp_sdk_path.exists():
+            logs.append("❌ npm packages installation failed (MCP SDK not found)")
+            logs.append(f"   Expected path: {mcp_sdk_path}")
+            return {'success': False, 'message': 'npm installation incomplete', 'detail': None, 'logs': logs}
+        
+        logs.append("✅ npm packages installed successfully")
+        fingerprint = _npm_tree_fingerprint()
+        if fingerprint:
+            _NPM_SENTINEL.write_text(fingerprint)
+        check_dependencies.cache_clear()
+        # Count installed packages and calculate size
+        try:
+            pkg_count, total_size = _node_modules_stats(node_modules_path)
+            size_mb = total_size / (1024 * 1024)
+            detail = f'Installed ({pkg_count} packages, {size_mb:.1f} MB)'
+            logs.append(f"   Installed {pkg_count} packages ({size_mb:.1f} MB)")
+        except Exception as e:
+            detail = 'Installed'
+            logs.append(f"   Package count error: {str(e)}")
+        
+        # Verify specific key packages
+        key_packages = ['@modelcontextprotocol/sdk', '@executeautomation/playwright-mcp-server']
+        for pkg in key_packages:
+            pkg_path = node_modules_path / pkg.replace('/', os.sep)
+            if pkg_path.exists():
+                logs.append(f"   ✅ {pkg} verified")
+            else:
+                logs.append(f"   ⚠️  {pkg} not found")
+        return {'success': True, 'message': 'npm packages installed', 'detail': detail, 'logs': logs}
+    except subprocess.TimeoutExpired:
+        logs.append("❌ npm install timed out after 5 minutes")
+        return {'success': False, 'message': 'npm install timeout', 'detail': None, 'logs': logs}
+    except Exception as e:
+        logs.append(f"❌ npm install error: {str(e)}")
+        return {'success': False, 'message': str(e), 'detail': None, 'logs': logs}
+    finally:
+        # Always release the Playwright worker; it re-checks for the CLI itself
+        playwright_ready.set()
+
+def _install_playwright(node_modules_path: Path, playwright_marker: Path, playwright_ready: threading.Event) -> Dict:
+    """
+    Install the Playwright browser once playwright-core is available.
+    Returns dict with success, message, detail and logs.
+    """
+    logs = []
+    
+    playwright_ready.wait(timeout=300)
+    if not (node_modules_path / 'playwright-core' / 'cli.js').exists():
+        logs.append("⚠️  Skipping Playwright install (playwright-core not available)")
+        return {'success': False, 'message': 'playwright-core not available', 'detail': None, 'logs': logs}
+    
+    logs.append("🎭 Installing Playwright Chromium browser...")
+    
+    # Install browsers for playwright-core (used by MCP server)
+    # MCP server looks in: node_modules/playwright-core/.local-browsers/
+    # CRITICAL: Set PLAYWRIGHT_BROWSERS_PATH=0 to force LOCAL installation
+    
+    logs.append(f"   Started at: {datetime.now().strftime('%H:%M:%S')}")
+    logs.append(f"   Target: node_modules/playwright-core/.local-browsers/")
+    
+    # Prepare environment with LOCAL browser installation flag
+    install_env = os.environ.copy()
+    install_env['PLAYWRIGHT_BROWSERS_PATH'] = '0'  # Force local installation
+    logs.append(f"   PLAYWRIGHT_BROWSERS_PATH=0 (forces local install)")
+    
+    # Detect OS - use chromium for Linux (Streamlit Cloud), chrome for macOS
+    import platform
+    is_linux = platform.system() == 'Linux'
+    browser_type = 'chromium' if is_linux else 'chrome'
+    logs.append(f"   Platform: {platform.system()}, Browser: {browser_type}")
+    
+    # Browser installs are alternatives (first success wins); install-deps always runs
+    install_commands = [
+        {
+            'cmd': ['node', 'node_modules/playwright-core/cli.js', 'install', browser_type],
+            'desc': f'playwright-core CLI - {browser_type} (local mode)',
+            'env': install_env,
+            'fallback': False
+        },
+        {
+            'cmd': ['npx', 'playwright-core', 'install', browser_type],
+            'desc': f'playwright-core via npx - {browser_type} (local mode)',
+            'env': install_env,
+            'fallback': True
+        },
+        {
+            'cmd': ['npx', 'playwright-core', 'install-deps', browser_type],
+            'desc': f'playwright-core dependencies for {browser_type}',
+            'env': install_env,
+            'fallback': False
+        }
+    ]
+    
+    all_successful = False
+    local_browsers = node_modules_path / 'playwright-core' / '.local-browsers'
+    
+    for install_cmd in install_commands:
+        if install_cmd['fallback']:
+            if not all_successful and local_browsers.is_dir() and any(local_browsers.iterdir()):
+                # Primary reported an error but the browser landed anyway
+                logs.append(f"   ✅ Browser found in {local_browsers.name}/, skipping fallback")
+                all_successful = True
+            if all_successful:
+                continue  # Primary install already succeeded
+        
+        logs.append(f"   Installing: {install_cmd['desc']}")
+        logs.append(f"   Command: {' '.join(install_cmd['cmd'][:4])}...")
+        
+        try:
+            start_time = time.time()
+            result = subprocess.run(
+                install_cmd['cmd'],
+                cwd=_HERE,
+                capture_output=True,
+                text=True,
+                timeout=300,  # 5 minute timeout
+                env=install_cmd.get('env', os.environ.copy())  # Use custom env if provided
+            )
+            elapsed = time.time() - start_time
+            
+            logs.append(f"   Completed in {elapsed:.1f} seconds")
+            logs.append(f"   Return code: {result.returncode}")
+            
+            if result.returncode == 0:
+                logs.append(f"   ✅ {install_cmd['desc']} installed successfully")
+                all_successful = True
+            else:
+                logs.append(f"   ⚠️  {install_cmd['desc']} returned {result.returncode}")
+                if result.stderr:
+                    logs.append(f"   {result.stderr[:100]}")
+        except Exception as e:
+            logs.append(f"   ⚠️  {install_cmd['desc']} error: {str(e)[:50]}")
+            continue
+    
+    # After trying all methods, verify browser binary exists
+    # Chrome uses the system Chrome installation via channel
+    # Check for marker file instead of specific browser path
+    logs.append(f"   Verifying Chrome browser installation...")
+    
+    playwright_marker.touch()  # Also marks failures as attempted to avoid retry loops
+    check_dependencies.cache_clear()
+    if all_successful:
+        logs.append(f"   ✅ Chrome browser installed successfully!")
+        detail = 'Chrome installed and verified'
+    else:
+        logs.append("   ❌ Browser installation failed")
+        logs.append("   ⚠️  All installation methods failed")
+        detail = 'Installation failed - try Force Reinstall'
+    return {'success': all_successful, 'message': detail, 'detail': detail, 'logs': logs}
+
 def install_dependencies_if_needed():
     """
     Install npm packages and Playwright browsers if not present.
     This should be called lazily, not at import time.
+    The browser download starts as soon as npm has unpacked playwright-core.
     Returns dict with success status, logs, and details.
     """
     deps = check_dependencies()
@@ -82,174 +469,47 @@ def install_dependencies_if_needed():
         }
     
     # Path to node_modules
-    node_modules_path = Path(__file__).parent / 'node_modules'
+    node_modules_path = _HERE / 'node_modules'
     mcp_sdk_path = node_modules_path / '@modelcontextprotocol' / 'sdk'
-    playwright_marker = Path(__file__).parent / '.playwright_installed'
+    playwright_marker = _PLAYWRIGHT_MARKER
     
     logs = []
     details = {}
+    playwright_ready = threading.Event()
+    npm_future = playwright_future = None
     
-    # Install npm packages if needed
-    if not mcp_sdk_path.exists():
-        logs.append("📦 Installing npm packages...")
-        logs.append(f"   Working directory: {Path(__file__).parent}")
-        logs.append(f"   Command: npm install --production --prefer-offline")
-        logs.append(f"   Started at: {datetime.now().strftime('%H:%M:%S')}")
-        
-        try:
-            start_time = time.time()
-            result = subprocess.run(
-                ['npm', 'install', '--production', '--prefer-offline'],
-                cwd=Path(__file__).parent,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
-            elapsed = time.time() - start_time
-            
-            logs.append(f"   Completed in {elapsed:.1f} seconds")
-            logs.append(f"   Return code: {result.returncode}")
-            
-            # Show npm output (abbreviated)
-            if result.stdout:
-                stdout_lines = result.stdout.strip().split('\n')
-                logs.append(f"   Output: {stdout_lines[-1] if stdout_lines else 'none'}")  # Last line
-            
-            if result.returncode == 0:
-                # Verify installation
-                if mcp_sdk_path.exists():
-                    logs.append("✅ npm packages installed successfully")
-                    # Count installed packages and calculate size
-                    try:
-                        pkg_count = len(list(node_modules_path.iterdir())) if node_modules_path.exists() else 0
-                        # Calculate total size
-                        total_size = sum(f.stat().st_size for f in node_modules_path.rglob('*') if f.is_file())
-                        size_mb = total_size / (1024 * 1024)
-                        details['npm_packages'] = f'Installed ({pkg_count} packages, {size_mb:.1f} MB)'
-                        logs.append(f"   Installed {pkg_count} packages ({size_mb:.1f} MB)")
-                    except Exception as e:
-                        details['npm_packages'] = 'Installed'
-                        logs.append(f"   Package count error: {str(e)}")
-                    
-                    # Verify specific key packages
-                    key_packages = ['@modelcontextprotocol/sdk', '@executeautomation/playwright-mcp-server']
-                    for pkg in key_packages:
-                        pkg_path = node_modules_path / pkg.replace('/', os.sep)
-                        if pkg_path.exists():
-                            logs.append(f"   ✅ {pkg} verified")
-                        else:
-                            logs.append(f"   ⚠️  {pkg} not found")
-                else:
-                    logs.append("❌ npm packages installation failed (MCP SDK not found)")
-                    logs.append(f"   Expected path: {mcp_sdk_path}")
-                    return {'success': False, 'message': 'npm installation incomplete', 'details': details, 'logs': logs}
-            else:
-                logs.append(f"❌ npm install failed with return code {result.returncode}")
-                if result.stderr:
-                    logs.append(f"   Error: {result.stderr[:300]}")
-                return {'success': False, 'message': 'npm install failed', 'details': details, 'logs': logs}
-        except subprocess.TimeoutExpired:
-            logs.append("❌ npm install timed out after 5 minutes")
-            return {'success': False, 'message': 'npm install timeout', 'details': details, 'logs': logs}
-        except Exception as e:
-            logs.append(f"❌ npm install error: {str(e)}")
-            return {'success': False, 'message': str(e), 'details': details, 'logs': logs}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        if not mcp_sdk_path.exists():
+            npm_future = pool.submit(_install_npm, node_modules_path, mcp_sdk_path, playwright_ready)
+        else:
+            playwright_ready.set()
+        if not playwright_marker.exists():
+            playwright_future = pool.submit(_install_playwright, node_modules_path, playwright_marker, playwright_ready)
+        wait([f for f in (npm_future, playwright_future) if f is not None])
+    
+    # Merge per-task logs after both workers finished so each section stays contiguous
+    if npm_future is not None:
+        npm_result = npm_future.result()
+        logs.extend(npm_result['logs'])
+        if not npm_result['success']:
+            if playwright_future is not None:
+                logs.extend(playwright_future.result()['logs'])
+            return {'success': False, 'message': npm_result['message'], 'details': details, 'logs': logs}
+        details['npm_packages'] = npm_result['detail']
     else:
         logs.append("✅ npm packages already installed")
         # Show what's already there
         try:
-            pkg_count = len(list(node_modules_path.iterdir())) if node_modules_path.exists() else 0
+            pkg_count = _count_entries(node_modules_path) if node_modules_path.exists() else 0
             logs.append(f"   Found {pkg_count} existing packages")
         except:
             pass
         details['npm_packages'] = 'Already installed'
     
-    # Install Playwright browsers if needed
-    if not playwright_marker.exists():
-        logs.append("🎭 Installing Playwright Chromium browser...")
-        
-        # Install browsers for playwright-core (used by MCP server)
-        # MCP server looks in: node_modules/playwright-core/.local-browsers/
-        # CRITICAL: Set PLAYWRIGHT_BROWSERS_PATH=0 to force LOCAL installation
-        
-        logs.append(f"   Started at: {datetime.now().strftime('%H:%M:%S')}")
-        logs.append(f"   Target: node_modules/playwright-core/.local-browsers/")
-        
-        # Prepare environment with LOCAL browser installation flag
-        install_env = os.environ.copy()
-        install_env['PLAYWRIGHT_BROWSERS_PATH'] = '0'  # Force local installation
-        logs.append(f"   PLAYWRIGHT_BROWSERS_PATH=0 (forces local install)")
-        
-        # Detect OS - use chromium for Linux (Streamlit Cloud), chrome for macOS
-        import platform
-        is_linux = platform.system() == 'Linux'
-        browser_type = 'chromium' if is_linux else 'chrome'
-        logs.append(f"   Platform: {platform.system()}, Browser: {browser_type}")
-        
-        install_commands = [
-            {
-                'cmd': ['node', 'node_modules/playwright-core/cli.js', 'install', browser_type],
-                'desc': f'playwright-core CLI - {browser_type} (local mode)',
-                'env': install_env
-            },
-            {
-                'cmd': ['npx', 'playwright-core', 'install', browser_type],
-                'desc': f'playwright-core via npx - {browser_type} (local mode)',
-                'env': install_env
-            },
-            {
-                'cmd': ['npx', 'playwright-core', 'install-deps', browser_type],
-                'desc': f'playwright-core dependencies for {browser_type}',
-                'env': install_env
-            }
-        ]
-        
-        all_successful = False
-        
-        for install_cmd in install_commands:
-            logs.append(f"   Installing: {install_cmd['desc']}")
-            logs.append(f"   Command: {' '.join(install_cmd['cmd'][:4])}...")
-            
-            try:
-                start_time = time.time()
-                result = subprocess.run(
-                    install_cmd['cmd'],
-                    cwd=Path(__file__).parent,
-                    capture_output=True,
-                    text=True,
-                    timeout=300,  # 5 minute timeout
-                    env=install_cmd.get('env', os.environ.copy())  # Use custom env if provided
-                )
-                elapsed = time.time() - start_time
-                
-                logs.append(f"   Completed in {elapsed:.1f} seconds")
-                logs.append(f"   Return code: {result.returncode}")
-                
-                if result.returncode == 0:
-                    logs.append(f"   ✅ {install_cmd['desc']} installed successfully")
-                    all_successful = True
-                else:
-                    logs.append(f"   ⚠️  {install_cmd['desc']} returned {result.returncode}")
-                    if result.stderr:
-                        logs.append(f"   {result.stderr[:100]}")
-            except Exception as e:
-                logs.append(f"   ⚠️  {install_cmd['desc']} error: {str(e)[:50]}")
-                continue
-        
-        # After trying all methods, verify browser binary exists
-        # Chrome uses the system Chrome installation via channel
-        # Check for marker file instead of specific browser path
-        logs.append(f"   Verifying Chrome browser installation...")
-        
-        if all_successful:
-            logs.append(f"   ✅ Chrome browser installed successfully!")
-            playwright_marker.touch()
-            details['playwright'] = 'Chrome installed and verified'
-        else:
-            logs.append("   ❌ Browser installation failed")
-            logs.append("   ⚠️  All installation methods failed")
-            playwright_marker.touch()  # Mark as attempted to avoid retry loops
-            details['playwright'] = 'Installation failed - try Force Reinstall'
+    if playwright_future is not None:
+        playwright_result = playwright_future.result()
+        logs.extend(playwright_result['logs'])
+        details['playwright'] = playwright_result['detail']
     else:
         logs.append("✅ Playwright already installed")
         logs.append(f"   Marker file exists: {playwright_marker}")
@@ -277,6 +537,18 @@ def install_dependencies_if_needed():
 # Setup virtual display at import time (fast, non-blocking)
 setup_virtual_display()
 
+# Executor environment overrides: headless on cloud, visible browser locally (for manual login)
+_EXEC_OVERRIDES = {
+    'PLAYWRIGHT_HEADLESS': '1' if _IS_CLOUD else '0',
+    'BROWSER_HEADLESS': 'true' if _IS_CLOUD else 'false',
+    'HEADLESS': 'true' if _IS_CLOUD else 'false',
+    'PLAYWRIGHT_CHROMIUM_NO_SANDBOX': '1'  # Additional Playwright browser arg for stability
+}
+
+def _exec_env() -> Dict[str, str]:
+    """Executor subprocess environment, built from the current os.environ on every call"""
+    return {**os.environ, 'DISPLAY': os.environ.get('DISPLAY') or ':99', **_EXEC_OVERRIDES}
+
 # Page configuration
 st.set_page_config(
     page_title="MDC Automation Executor",
@@ -286,46 +558,172 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .stButton>button {
-        width: 100%;
-        background-color: #1f77b4;
-        color: white;
-        font-weight: bold;
-        border-radius: 8px;
-        padding: 0.5rem 1rem;
-    }
-    .success-box {
-        padding: 1rem;
-        border-radius: 8px;
-        background-color: #d4edda;
-        border: 1px solid #c3e6cb;
-        color: #155724;
-    }
-    .error-box {
-        padding: 1rem;
-        border-radius: 8px;
-        background-color: #f8d7da;
-        border: 1px solid #f5c6cb;
-        color: #721c24;
-    }
-    .info-box {
-        padding: 1rem;
-        border-radius: 8px;
-        background-color: #d1ecf1;
-        border: 1px solid #bee5eb;
-        color: #0c5460;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data(show_spinner=False)
+def _load_css(mtime: float) -> str:
+    """styles.css wrapped in a <style> tag; re-read only when the file changes"""
+    return f"<style>\n{(_HERE / 'styles.css').read_text()}</style>"
+
+st.markdown(_load_css((_HERE / 'styles.css').stat().st_mtime), unsafe_allow_html=True)
+
+def _wait_process(proc: subprocess.Popen, timeout: float) -> int:
+    """
+    Wait for proc to exit. On Linux this blocks on a pidfd, one wakeup when the
+    process dies, instead of Popen.wait's sleep/poll loop. Raises TimeoutExpired.
+    """
+    if not hasattr(os, 'pidfd_open'):
+        return proc.wait(timeout=timeout)
+    try:
+        fd = os.pidfd_open(proc.pid)
+    except OSError:
+        # Already reaped, or pidfd unsupported by the kernel
+        return proc.wait(timeout=timeout)
+    try:
+        poller = select.poll()
+        poller.register(fd, select.POLLIN)
+        if not poller.poll(timeout * 1000):
+            raise subprocess.TimeoutExpired(proc.args, timeout)
+    finally:
+        os.close(fd)
+    return proc.wait()
+
+
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    """Kill a worker and everything it spawned (xvfb-run leaves Xvfb and node behind otherwise)"""
+    if proc.poll() is None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            proc.kill()
+        proc.wait()
+
+
+class MDCWorker:
+    """
+    Long-lived `node mdc_executor.js --serve` process.
+    Requests and responses are JSON lines over stdin/stdout; one request at a time.
+    The process group is killed on close(), when the worker is garbage collected,
+    or at interpreter exit (weakref.finalize runs its callbacks via atexit).
+    """
+    
+    # Max stderr lines kept between requests
+    MAX_STDERR_LINES = 10_000
+    
+    def __init__(self, cmd_prefix: List[str], env: Dict):
+        self.cmd_prefix = list(cmd_prefix)
+        self.env = env
+        self.proc = subprocess.Popen(
+            self.cmd_prefix + ["--serve"],
+            cwd=_HERE,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=1,
+            text=True,
+            env=env,
+            start_new_session=True  # Own process group, so teardown reaches Xvfb/node children
+        )
+        self._finalizer = weakref.finalize(self, _kill_process_group, self.proc)
+        self._lock = threading.Lock()
+        self._responses = queue.Queue()
+        self._stderr = deque(maxlen=self.MAX_STDERR_LINES)
+        # Readers get only the streams and buffers, so they do not keep the worker alive
+        threading.Thread(target=self._read_stdout, args=(self.proc.stdout, self._responses), daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(self.proc.stderr, self._stderr), daemon=True).start()
+    
+    @staticmethod
+    def _read_stdout(stream: IO[str], responses: queue.Queue):
+        for line in stream:
+            try:
+                message = orjson.loads(line) if orjson else json.loads(line)
+            except ValueError:
+                continue  # Startup banner before the worker takes over stdout
+            if isinstance(message, dict) and 'returncode' in message:
+                responses.put(message)
+        responses.put(None)  # EOF: process exited
+    
+    @staticmethod
+    def _read_stderr(stream: IO[str], lines: deque):
+        for line in stream:
+            lines.append(line)
+    
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+    
+    def busy(self) -> bool:
+        return self._lock.locked()
+    
+    def run(self, mdc_path: str, context: Dict, timeout: int) -> Optional[subprocess.CompletedProcess]:
+        """
+        Execute one MDC file. Returns None if the worker was already gone or is busy
+        with another session's run (nothing ran, safe to run one-shot instead);
+        raises TimeoutExpired after killing it.
+        """
+        request = json.dumps({"mdc": mdc_path, "context": context or {}}, separators=(',', ':'))
+        # Sessions share one worker; when it is busy, run one-shot instead of queueing behind it
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            return self._run_locked(request, timeout)
+        finally:
+            self._lock.release()
+    
+    def _run_locked(self, request: str, timeout: int) -> Optional[subprocess.CompletedProcess]:
+        """Body of run(); the caller holds _lock"""
+        self._stderr.clear()
+        try:
+            self.proc.stdin.write(request + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            return None
+        
+        try:
+            message = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            self.close()
+            raise subprocess.TimeoutExpired(self.cmd_prefix, timeout)
+        
+        stderr = ''.join(self._stderr)
+        if message is None:
+            return subprocess.CompletedProcess(
+                self.cmd_prefix, self.proc.wait(), '', stderr or 'Executor process exited unexpectedly'
+            )
+        return subprocess.CompletedProcess(
+            self.cmd_prefix, message['returncode'], message.get('stdout', ''),
+            (message.get('stderr', '') + stderr)
+        )
+    
+    def close(self):
+        self._finalizer()
+
+
+class _WorkerSlot:
+    """The process-wide MDCWorker and the lock guarding its (re)start"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.worker: Optional[MDCWorker] = None
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_worker_slot() -> _WorkerSlot:
+    """One worker slot for the whole process, so sessions share a single node process"""
+    return _WorkerSlot()
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Replace path with payload via a uniquely named temp file, so concurrent writers never share one"""
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            tmp.write(payload)
+        os.replace(tmp.name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise
+
 
 class MDCExecutor:
     """Handles execution of MDC files with Playwright MCP"""
@@ -338,6 +736,71 @@ class MDCExecutor:
         self.cache_file = Path(".mdc_cache.json")
         self.last_fetch = None
         
+        # In-memory copy of the cache file, invalidated by its mtime
+        self._cache_mem = None
+        self._cache_mtime = 0
+        
+        # Shared HTTP session, created on first remote fetch (see _get_session)
+        self._session = None
+        
+        # Local MDC descriptions keyed by path -> ((mtime_ns, size), description)
+        self._descriptions = {}
+        
+        # Authentication secrets, read once per executor (i.e. once per session); see reload_auth
+        self._auth_context = self._load_auth_once()
+        
+        # Use the process-wide `mdc_executor.js --serve` process (see _get_worker)
+        self.use_worker = os.getenv("MDC_PERSISTENT_WORKER", "1") != "0"
+        
+    def _load_auth_once(self) -> Dict:
+        """Read the Autodesk token and parsed Draftr cookies from Streamlit secrets in one pass"""
+        auth = {'autodesk_token': None, 'token_expires_at': 0, 'cookies': None}
+        try:
+            if not hasattr(st, 'secrets'):
+                return auth
+            secrets = st.secrets
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Available secrets: %s", list(secrets.keys()))
+            if 'AUTODESK_ACCESS_TOKEN' in secrets:
+                auth['autodesk_token'] = secrets['AUTODESK_ACCESS_TOKEN']
+                auth['token_expires_at'] = secrets.get('AUTODESK_TOKEN_EXPIRES_AT', 0)
+            if 'DRAFTR_COOKIES' in secrets:
+                # Parsed once here; every execution reuses the same list
+                cookies_json = secrets['DRAFTR_COOKIES']
+                auth['cookies'] = orjson.loads(cookies_json) if orjson else json.loads(cookies_json)
+        except Exception as e:
+            log.warning("⚠️  Could not load authentication from secrets: %s", e)
+        return auth
+    
+    @property
+    def auth_context(self) -> Dict:
+        """Secrets snapshot used for executions (shared, do not mutate)"""
+        return self._auth_context
+    
+    def reload_auth(self) -> Dict:
+        """Re-read authentication secrets, e.g. after DRAFTR_COOKIES or AUTODESK_ACCESS_TOKEN was edited"""
+        self._auth_context = self._load_auth_once()
+        return self._auth_context
+    
+    def _get_session(self):
+        """Shared HTTP session so remote list/file fetches reuse keep-alive connections"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": "mdc-automation-executor"})
+            self._session = session
+        return self._session
+    
     def get_available_mdc_files(self) -> List[Dict[str, str]]:
         """Get available MDC files from local directory or remote server"""
         # Use remote only if explicitly configured
@@ -357,24 +820,45 @@ class MDCExecutor:
         if not self.mdc_directory.exists():
             return mdc_files
             
-        for file in self.mdc_directory.glob("*.mdc"):
-            with open(file, 'r') as f:
-                content = f.read()
-                description = self._extract_description(content)
+        with os.scandir(self.mdc_directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.mdc') or not entry.is_file(follow_symlinks=False):
+                    continue
+                
+                stat = entry.stat(follow_symlinks=False)
                 mdc_files.append({
-                    "name": file.name,
-                    "path": str(file),
-                    "description": description,
+                    "name": entry.name,
+                    "path": entry.path,
+                    "description": self.get_description(entry.path, (stat.st_mtime_ns, stat.st_size)),
                     "source": "local"
                 })
         return mdc_files
     
+    def get_description(self, path: str, version: Optional[Tuple[int, int]] = None) -> str:
+        """
+        Description of a local MDC file, memoized per (mtime_ns, size).
+        Only files that are new or changed since the last scan are opened.
+        """
+        if version is None:
+            stat = os.stat(path)
+            version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._descriptions.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        with open(path, 'r') as f:
+            description = self._extract_description(f)
+        self._descriptions[path] = (version, description)
+        return description
+    
     def _fetch_remote_mdc_files(self) -> List[Dict[str, str]]:
         """Fetch MDC files from remote server with caching"""
         # Check cache first
         if self._is_cache_valid():
             return self._load_from_cache()
         
+        import requests
+        
         # Fetch from remote
         mdc_files = []
         
@@ -382,25 +866,43 @@ class MDCExecutor:
         list_url = f"{self.remote_url}/list" if not self.remote_url.endswith('/list') else self.remote_url
         
         try:
-            response = requests.get(list_url, timeout=10)
+            response = self._get_session().get(list_url, timeout=10)
             response.raise_for_status()
             
             # Expecting JSON response: [{"name": "file.mdc", "url": "...", "description": "..."}]
             remote_files = response.json()
             
-            for file_info in remote_files:
-                # Download the actual MDC content
-                content = self._download_mdc_content(file_info.get('url') or file_info.get('name'))
-                
-                # Cache locally
-                local_path = self._cache_remote_file(file_info['name'], content)
+            # Entries from the last fetch (even if stale) supply ETag/Last-Modified validators
+            previous = self._previous_cache_entries()
+            
+            # Stream each MDC file straight to the local cache, concurrently over the shared session
+            with ThreadPoolExecutor(max_workers=max(1, min(16, len(remote_files)))) as pool:
+                downloads = list(pool.map(
+                    lambda info: self._download_mdc_content(
+                        info.get('url') or info.get('name'),
+                        self._remote_cache_path(info['name']),
+                        previous.get(info['name'])
+                    ),
+                    remote_files
+                ))
+            
+            for file_info, (modified, validators) in zip(remote_files, downloads):
+                local_path = str(self._remote_cache_path(file_info['name']))
+                description = file_info.get('description')
+                if not description and not modified:
+                    # 304 Not Modified: keep the description from the last fetch
+                    description = previous[file_info['name']].get('description')
+                if not description:
+                    with open(local_path, 'r') as f:
+                        description = self._extract_description(f)
                 
                 mdc_files.append({
                     "name": file_info['name'],
                     "path": local_path,
-                    "description": file_info.get('description') or self._extract_description(content),
+                    "description": description,
                     "source": "remote",
-                    "remote_url": file_info.get('url')
+                    "remote_url": file_info.get('url'),
+                    **validators
                 })
             
             # Save to cache
@@ -413,37 +915,60 @@ class MDCExecutor:
         
         return mdc_files
     
-    def _download_mdc_content(self, file_url: str) -> str:
-        """Download MDC file content from URL"""
+    def _download_mdc_content(self, file_url: str, dest_path: Path,
+                              prev_entry: Optional[Dict] = None) -> Tuple[bool, Dict]:
+        """
+        Stream MDC file content from URL to dest_path.
+        With a previous cache entry, sends a conditional GET and leaves dest_path
+        untouched on 304 Not Modified. Returns (modified, validators).
+        """
         if not file_url.startswith('http'):
             file_url = f"{self.remote_url.rstrip('/')}/{file_url}"
         
-        response = requests.get(file_url, timeout=10)
-        response.raise_for_status()
-        return response.text
+        headers = {}
+        if prev_entry and dest_path.is_file():
+            if prev_entry.get('etag'):
+                headers['If-None-Match'] = prev_entry['etag']
+            if prev_entry.get('last_modified'):
+                headers['If-Modified-Since'] = prev_entry['last_modified']
+        
+        with self._get_session().get(file_url, headers=headers, stream=True, timeout=10) as response:
+            if response.status_code == 304 and headers:
+                return False, {k: prev_entry[k] for k in ('etag', 'last_modified') if prev_entry.get(k)}
+            response.raise_for_status()
+            
+            # Raw bytes go straight to disk; swap in the finished file so readers never see a partial one
+            tmp_path = dest_path.with_name(dest_path.name + '.part')
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(65536):
+                    f.write(chunk)
+            os.replace(tmp_path, dest_path)
+            
+            validators = {}
+            if response.headers.get('ETag'):
+                validators['etag'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                validators['last_modified'] = response.headers['Last-Modified']
+        return True, validators
+    
+    def _previous_cache_entries(self) -> Dict[str, Dict]:
+        """Last cached file entries by name, regardless of cache age"""
+        return {entry['name']: entry for entry in self._load_cache_metadata().get('files', [])}
     
-    def _cache_remote_file(self, filename: str, content: str) -> str:
-        """Cache remote MDC file locally"""
+    def _remote_cache_path(self, filename: str) -> Path:
+        """Local cache location for a remote MDC file"""
         cache_dir = Path(".mdc_remote_cache")
         cache_dir.mkdir(exist_ok=True)
-        
-        local_path = cache_dir / filename
-        with open(local_path, 'w') as f:
-            f.write(content)
-        
-        return str(local_path)
+        return cache_dir / filename
     
     def _is_cache_valid(self) -> bool:
         """Check if cache is still valid"""
-        if not self.cache_file.exists():
-            return False
-        
         cache_data = self._load_cache_metadata()
         if not cache_data:
             return False
         
-        cache_time = datetime.fromisoformat(cache_data.get('timestamp', '2000-01-01'))
-        return datetime.now() - cache_time < timedelta(minutes=self.cache_duration)
+        cache_epoch = cache_data.get('epoch')
+        return cache_epoch is not None and time.time() - cache_epoch < self.cache_duration * 60
     
     def _load_from_cache(self) -> List[Dict[str, str]]:
         """Load MDC files from cache"""
@@ -453,17 +978,30 @@ class MDCExecutor:
     def _save_to_cache(self, mdc_files: List[Dict[str, str]]):
         """Save MDC files list to cache"""
         cache_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now().isoformat(),  # Human-readable, shown in sidebar
+            'epoch': int(time.time()),
             'files': mdc_files
         }
-        with open(self.cache_file, 'w') as f:
-            json.dump(cache_data, f)
+        if orjson:
+            payload = orjson.dumps(cache_data)
+        else:
+            payload = json.dumps(cache_data, separators=(',', ':')).encode()
+        
+        # Write to a temp file and swap it in so readers never see a partial file
+        _atomic_write_bytes(self.cache_file, payload)
+        self._cache_mem = cache_data
+        self._cache_mtime = self.cache_file.stat().st_mtime
     
     def _load_cache_metadata(self) -> Dict:
         """Load cache metadata"""
         try:
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
+            mtime = self.cache_file.stat().st_mtime
+            if self._cache_mem is not None and mtime == self._cache_mtime:
+                return self._cache_mem
+            payload = self.cache_file.read_bytes()
+            self._cache_mem = orjson.loads(payload) if orjson else json.loads(payload)
+            self._cache_mtime = mtime
+            return self._cache_mem
         except:
             return {}
     
@@ -472,21 +1010,45 @@ class MDCExecutor:
         # This is a fallback if the server doesn't have a list endpoint
         # You can configure expected filenames in environment
         mdc_files = []
-        expected_files = os.getenv("MDC_EXPECTED_FILES", "").split(',')
+        expected_files = [
+            filename.strip()
+            for filename in os.getenv("MDC_EXPECTED_FILES", "").split(',')
+            if filename.strip()
+        ]
+        if not expected_files:
+            return mdc_files
+        
+        previous = self._previous_cache_entries()
+        
+        def download(filename):
+            try:
+                return self._download_mdc_content(
+                    filename, self._remote_cache_path(filename), previous.get(filename)
+                )
+            except Exception:
+                return None
         
-        for filename in expected_files:
-            if not filename.strip():
+        with ThreadPoolExecutor(max_workers=min(16, len(expected_files))) as pool:
+            downloads = list(pool.map(download, expected_files))
+        
+        for filename, download_result in zip(expected_files, downloads):
+            if download_result is None:
                 continue
+            modified, validators = download_result
                 
             try:
-                content = self._download_mdc_content(filename.strip())
-                local_path = self._cache_remote_file(filename.strip(), content)
+                local_path = str(self._remote_cache_path(filename))
+                description = None if modified else previous[filename].get('description')
+                if not description:
+                    with open(local_path, 'r') as f:
+                        description = self._extract_description(f)
                 
                 mdc_files.append({
-                    "name": filename.strip(),
+                    "name": filename,
                     "path": local_path,
-                    "description": self._extract_description(content),
-                    "source": "remote"
+                    "description": description,
+                    "source": "remote",
+                    **validators
                 })
             except:
                 continue
@@ -497,53 +1059,38 @@ class MDCExecutor:
         """Force refresh from remote server"""
         if self.cache_file.exists():
             self.cache_file.unlink()
+        self._cache_mem = None
+        self._cache_mtime = 0
         self.last_fetch = None
     
-    def _extract_description(self, content: str) -> str:
-        """Extract description from MDC file content"""
-        lines = content.split('\n')
-        for line in lines[:10]:  # Check first 10 lines
-            if 'description' in line.lower() or line.startswith('#'):
-                return line.strip('# ').strip()
+    # First line that is a heading or mentions "description"
+    _DESC_RE = re.compile(r'^(?:#[^\n]*|[^\n]*description[^\n]*)', re.IGNORECASE | re.MULTILINE)
+    
+    def _extract_description(self, content: Union[str, IO[str]]) -> str:
+        """Extract description from MDC file content (a string or an open text file)"""
+        # Only the first 4 KB / 10 lines are ever inspected
+        head = content[:4096] if isinstance(content, str) else content.read(4096)
+        head = '\n'.join(head.split('\n', 10)[:10])
+        match = self._DESC_RE.search(head)
+        if match:
+            return match.group(0).strip('# ').strip()
         return "No description available"
     
     def execute_mdc_file(self, mdc_path: str, context: Dict = None) -> Dict:
         """Execute an MDC file with Playwright MCP"""
+        # Node.js and the executor script are probed once at import
+        if NODE_BIN is None or not _EXECUTOR_EXISTS:
+            missing = "Node.js not found on PATH" if NODE_BIN is None else f"Executor script not found: {_EXECUTOR_JS}"
+            return {
+                "success": False,
+                "error": missing,
+                "mdc_file": mdc_path
+            }
+        
         try:
-            # Read MDC file
-            with open(mdc_path, 'r') as f:
-                mdc_content = f.read()
-            
-            # Prepare execution command
-            # Use xvfb-run to wrap the command on Streamlit Cloud
-            is_cloud = os.getenv('STREAMLIT_RUNTIME_ENV') == 'cloud' or os.path.exists('/mount/src')
-            
-            # Choose executor based on environment
-            if is_cloud:
-                # Cloud: Use MCP server (headless)
-                executor_script = 'mdc_executor.js'
-            else:
-                # Local: Use direct Playwright (visible browser)
-                executor_script = 'playwright_direct_executor.js'
-                print(f"🏠 Local mode: Using direct Playwright executor for VISIBLE browser")
-            
-            if is_cloud:
-                # Wrap with xvfb-run to provide X server
-                cmd = [
-                    "xvfb-run",
-                    "--auto-servernum",
-                    "--server-args=-screen 0 1920x1080x24",
-                    "node",
-                    "mdc_executor.js",
-                    mdc_path
-                ]
-            else:
-                # Local execution without xvfb-run
-                cmd = [
-                    "node",
-                    "mdc_executor.js",
-                    mdc_path
-                ]
+            # Command prefix is fixed at import (see _EXEC_CMD); the environment tracks os.environ
+            cmd_prefix = list(_EXEC_CMD)
+            cmd = cmd_prefix + [mdc_path]
             
             # Load authentication from secrets (IDSDK token or cookies)
             if not context:
@@ -551,115 +1098,88 @@ class MDCExecutor:
             
             auth_method = None
             
-            # Check for authentication in secrets
+            # Authentication secrets were read once in __init__; only expiry is checked per run
+            auth = self._auth_context
             try:
-                print("🔍 Checking for authentication credentials...")
-                print(f"   hasattr(st, 'secrets'): {hasattr(st, 'secrets')}")
-                if hasattr(st, 'secrets'):
-                    print(f"   Available secrets: {list(st.secrets.keys())}")
+                log.debug("🔍 Checking for authentication credentials...")
                 
                 # Method 1: IDSDK OAuth Token (PREFERRED)
-                if hasattr(st, 'secrets') and 'AUTODESK_ACCESS_TOKEN' in st.secrets:
-                    print("🔐 Loading Autodesk OAuth token from secrets...")
-                    token = st.secrets['AUTODESK_ACCESS_TOKEN']
+                if auth['autodesk_token']:
+                    log.debug("🔐 Loading Autodesk OAuth token from secrets...")
+                    token = auth['autodesk_token']
                     
                     # Check if token is expired
-                    token_expires_at = st.secrets.get('AUTODESK_TOKEN_EXPIRES_AT', 0)
+                    token_expires_at = auth['token_expires_at']
                     if token_expires_at and time.time() < token_expires_at:
                         context['autodesk_token'] = token
                         auth_method = 'IDSDK OAuth Token'
                         expires_in = int(token_expires_at - time.time())
-                        print(f"✅ Loaded OAuth token (expires in {expires_in} seconds)")
+                        log.info("✅ Loaded OAuth token (expires in %d seconds)", expires_in)
                     else:
-                        print("⚠️  OAuth token expired!")
-                        print("   Run: python3 autodesk_idsdk_login.py")
+                        log.warning("⚠️  OAuth token expired! Run: python3 autodesk_idsdk_login.py")
                 
                 # Method 2: Session Cookies (FALLBACK)
-                if not auth_method and hasattr(st, 'secrets') and 'DRAFTR_COOKIES' in st.secrets:
-                    print("🔐 Loading authentication cookies from secrets...")
-                    cookies_json = st.secrets['DRAFTR_COOKIES']
-                    cookies = json.loads(cookies_json)
+                if not auth_method and auth['cookies']:
+                    log.debug("🔐 Loading authentication cookies from secrets...")
+                    cookies = auth['cookies']
                     context['cookies'] = cookies
                     auth_method = 'Session Cookies'
-                    print(f"✅ Loaded {len(cookies)} cookies for authentication")
+                    log.info("✅ Loaded %d cookies for authentication", len(cookies))
                 
                 # No authentication found
                 if not auth_method:
-                    print("❌ No authentication found in secrets!")
-                    print("⚠️  Automation will run WITHOUT authentication")
-                    print()
-                    print("📋 To add authentication:")
-                    print("   Option 1 (RECOMMENDED): IDSDK OAuth Token")
-                    print("      Run: python3 autodesk_idsdk_login.py")
-                    print("      Then copy token to secrets")
-                    print()
-                    print("   Option 2 (FALLBACK): Session Cookies")
-                    print("      Run: node capture-cookies.js")
-                    print("      Then add DRAFTR_COOKIES to secrets")
+                    log.warning(
+                        "❌ No authentication found in secrets! Automation will run WITHOUT authentication.\n"
+                        "📋 To add authentication:\n"
+                        "   Option 1 (RECOMMENDED): IDSDK OAuth Token\n"
+                        "      Run: python3 autodesk_idsdk_login.py, then copy token to secrets\n"
+                        "   Option 2 (FALLBACK): Session Cookies\n"
+                        "      Run: node capture-cookies.js, then add DRAFTR_COOKIES to secrets"
+                    )
                     
             except Exception as e:
-                print(f"⚠️  Could not load authentication from secrets: {e}")
-                print("⚠️  Continuing without authentication...")
-            
-            # Add context if provided
-            if context:
-                cmd.extend(["--context", json.dumps(context)])
-            
-            # Prepare environment with DISPLAY variable and headless config
-            env = os.environ.copy()
-            
-            # Ensure DISPLAY is set for browser automation
-            if 'DISPLAY' not in env or not env['DISPLAY']:
-                env['DISPLAY'] = ':99'
-                print(f"🔧 Setting DISPLAY={env['DISPLAY']} for subprocess")
+                log.warning("⚠️  Could not load authentication from secrets: %s. Continuing without authentication...", e)
             
-            # Configure headless mode based on environment
-            is_cloud_env = is_cloud  # Use the is_cloud variable from line 508
-            if is_cloud_env:
-                # Force headless on cloud (critical for cloud deployment)
-                env['PLAYWRIGHT_HEADLESS'] = '1'
-                env['BROWSER_HEADLESS'] = 'true'
-                env['HEADLESS'] = 'true'
-                print("☁️  Cloud mode: Browser will run HEADLESS")
+            env = _exec_env()
+            if _IS_CLOUD:
+                log.debug("☁️  Cloud mode: Browser will run HEADLESS")
             else:
-                # Allow visible browser locally (for manual login)
-                env['PLAYWRIGHT_HEADLESS'] = '0'
-                env['BROWSER_HEADLESS'] = 'false'
-                env['HEADLESS'] = 'false'
-                print("🏠 Local mode: Browser will be VISIBLE for 3 minutes (manual login)")
+                log.debug("🏠 Local mode: Browser will be VISIBLE for 3 minutes (manual login)")
             
-            # Additional Playwright browser args for stability
-            env['PLAYWRIGHT_CHROMIUM_NO_SANDBOX'] = '1'
-            
-            print(f"🚀 Executing: {' '.join(cmd)}")
-            print(f"📂 Working directory: {Path(__file__).parent}")
-            print(f"📺 DISPLAY={env.get('DISPLAY', 'NOT SET')}")
-            print(f"🎭 HEADLESS={env.get('PLAYWRIGHT_HEADLESS', 'NOT SET')}")
-            
-            # Check if Node.js is available
-            node_check = subprocess.run(['which', 'node'], capture_output=True, text=True)
-            print(f"🟢 Node.js path: {node_check.stdout.strip()}")
-            
-            # Check if mdc_executor.js exists
-            executor_path = Path(__file__).parent / 'mdc_executor.js'
-            print(f"🟢 Executor exists: {executor_path.exists()}")
+            log.info("🚀 Executing: %s", cmd)
+            log.debug("📂 Working directory: %s", _HERE)
+            log.debug("📺 DISPLAY=%s 🎭 HEADLESS=%s", env.get('DISPLAY', 'NOT SET'), env.get('PLAYWRIGHT_HEADLESS', 'NOT SET'))
             
             # Execute with explicit environment
             start_time = time.time()
-            result = subprocess.run(
-                cmd,
-                cwd=Path(__file__).parent,  # Ensure correct working directory
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-                env=env  # Pass environment with DISPLAY
-            )
+            result = None
+            if self.use_worker:
+                # Persistent node process: skips Node/V8 startup and module loading per run
+                worker = self._get_worker(cmd_prefix, env)
+                if worker is not None:
+                    result = worker.run(mdc_path, context, timeout=300)
+            
+            if result is None:
+                # One-shot process. Context is piped over stdin, keeping argv small whatever the cookie count
+                context_json = None
+                if context:
+                    if orjson:
+                        context_json = orjson.dumps(context).decode()
+                    else:
+                        context_json = json.dumps(context, separators=(',', ':'))
+                    cmd.append("--context-stdin")
+                
+                result = self._run_bounded(
+                    cmd,
+                    cwd=_HERE,  # Ensure correct working directory
+                    timeout=300,  # 5 minute timeout
+                    env=env,  # Pass environment with DISPLAY
+                    input_data=context_json
+                )
             elapsed = time.time() - start_time
             
-            print(f"⏱️  Execution completed in {elapsed:.2f} seconds")
-            print(f"📤 Return code: {result.returncode}")
-            print(f"📝 Stdout length: {len(result.stdout)} chars")
-            print(f"📝 Stderr length: {len(result.stderr)} chars")
+            log.info("⏱️  Execution completed in %.2f seconds (return code %s)", elapsed, result.returncode)
+            log.debug("📝 Stdout length: %d chars, stderr length: %d chars", len(result.stdout), len(result.stderr))
             
             return {
                 "success": result.returncode == 0,
@@ -681,13 +1201,297 @@ class MDCExecutor:
                 "mdc_file": mdc_path
             }
 
+    
+    # Max lines kept per stream when capturing executor output
+    MAX_OUTPUT_LINES = 10_000
+    
+    def _get_worker(self, cmd_prefix: List[str], env: Dict) -> Optional["MDCWorker"]:
+        """Shared live worker for this command and environment, (re)started as needed; None if it cannot start"""
+        slot = _shared_worker_slot()
+        with slot.lock:
+            worker = slot.worker
+            if worker is not None and worker.alive():
+                if worker.cmd_prefix == cmd_prefix and worker.env == env:
+                    return worker
+                if worker.busy():
+                    return None  # Another session is mid-run; do not kill its process
+            if worker is not None:
+                worker.close()
+            try:
+                slot.worker = MDCWorker(cmd_prefix, env)
+            except OSError as e:
+                log.warning("⚠️  Could not start persistent executor, using one-shot runs: %s", e)
+                slot.worker = None
+            return slot.worker
+    
+    def _run_bounded(self, cmd: List[str], cwd, timeout: int, env: Dict,
+                     input_data: Optional[str] = None) -> subprocess.CompletedProcess:
+        """Run a command, streaming stdout/stderr into bounded line buffers; input_data is written to stdin"""
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=1,
+            text=True,
+            env=env
+        )
+        stdout_lines = deque(maxlen=self.MAX_OUTPUT_LINES)
+        stderr_lines = deque(maxlen=self.MAX_OUTPUT_LINES)
+        
+        def drain(stream, lines):
+            for line in stream:
+                lines.append(line)
+            stream.close()
+        
+        readers = [
+            threading.Thread(target=drain, args=(proc.stdout, stdout_lines), daemon=True),
+            threading.Thread(target=drain, args=(proc.stderr, stderr_lines), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+        
+        try:
+            if input_data is not None:
+                try:
+                    proc.stdin.write(input_data)
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass  # Process exited early; its stderr says why
+            returncode = _wait_process(proc, timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+        
+        return subprocess.CompletedProcess(cmd, returncode, ''.join(stdout_lines), ''.join(stderr_lines))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_available_mdc(_executor: MDCExecutor, mdc_dir: str, remote_url: Optional[str],
+                          dir_mtime: float) -> List[Dict[str, str]]:
+    """Cached MDC file list, keyed on directory, its mtime and remote URL (executor is not hashed)"""
+    return _executor.get_available_mdc_files()
+
+
+def get_cached_mdc_files() -> List[Dict[str, str]]:
+    """Get available MDC files for the session executor, reusing results across reruns"""
+    executor = st.session_state.mdc_executor
+    mdc_dir = str(executor.mdc_directory)
+    # Adding/removing files bumps the directory mtime, which invalidates the cache entry
+    try:
+        dir_mtime = os.stat(mdc_dir).st_mtime
+    except OSError:
+        dir_mtime = 0.0
+    return _cached_available_mdc(executor, mdc_dir, executor.remote_url, dir_mtime)
+
+
+@st.cache_resource(show_spinner=False)
+def _aad_token_store() -> Dict[tuple, tuple]:
+    """Dict that survives reruns (app.py re-executes, so a plain module global would not)"""
+    return {}
+
+
+# Process-wide Azure AD token cache: (tenant_id, client_id) -> (token, expires_on)
+_AAD_TOKEN_CACHE: Dict[tuple, tuple] = _aad_token_store()
+AAD_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+
+def _get_cached_aad_token(credential, tenant_id: str, client_id: str) -> str:
+    """Return a cached Azure AD token, re-acquiring only when within 5 minutes of expiry"""
+    key = (tenant_id, client_id)
+    cached = _AAD_TOKEN_CACHE.get(key)
+    if cached and cached[1] - time.time() > 300:
+        return cached[0]
+    
+    token = credential.get_token(AAD_SCOPE)
+    _AAD_TOKEN_CACHE[key] = (token.token, token.expires_on)
+    return token.token
+
+
+def _client_fingerprint(*settings: Optional[str]) -> str:
+    """Short digest of the settings a chat client is built from, so secrets are not cache keys"""
+    return hashlib.sha1("\0".join(str(s) for s in settings).encode()).hexdigest()[:16]
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_openai_client(fingerprint: str, _build):
+    """One chat client per credential fingerprint for the whole process, so sessions and
+    reruns share its HTTPS connection pool; failures raise and are not cached"""
+    return _build()
+
+
+@st.cache_resource(show_spinner=False)
+def _match_cache_lock() -> threading.Lock:
+    """Serializes read-merge-write of the match cache file across sessions (survives reruns)"""
+    return threading.Lock()
+
 
 class PromptProcessor:
     """Process user prompts and match to appropriate MDC files"""
     
+    # Keyword tokens used by _simple_match (words longer than 3 characters)
+    _TOKEN_RE = re.compile(r"[a-z0-9]{4,}")
+    
+    # Static system prompt for AI matching. The MDC list follows as a separate message so this
+    # prefix stays byte-identical across calls and provider-side prompt caching can reuse it.
+    _STATIC_PRELUDE = """You are an automation assistant. Match user requests to available MDC automation files and extract variables.
+
+Respond with JSON containing:
+- "mdc_name": exact file name of the best matching MDC file from the "Available MDC files" message
+- "confidence": confidence score 0-1
+- "reason": brief explanation
+- "variables": extracted variables from the prompt (e.g., asset_id, new_url, link_text)
+
+For Draftr automation prompts, extract these variables:
+- "asset_id": Draftr asset ID (from URL like draftr/asset/3934720)
+- "new_url": Target URL to update link to (from patterns like to "url" or to <url>)
+- "link_text": Text to identify specific link (from patterns like link in "text")
+- "old_url": Old URL pattern to replace (from patterns like replace all "url")
+- "old_domain": Old domain to replace (from patterns like domain "/en/")
+- "new_domain": New domain to use (from patterns like to "/uk/")
+- "operation": Type of operation (change_specific, replace_all, replace_domain)
+
+Supported prompt formats:
+1. run mdc on https://webpub.autodesk.com/draftr/asset/123456 and change link in "text" to "newurl.com"
+2. run mdc on URL https://webpub.autodesk.com/draftr/asset/123456 to replace all "oldurl.com" links to "newurl.com"
+3. run mdc on URL https://webpub.autodesk.com/draftr/asset/123456 to replace all domain "/en/" links to "/uk/"
+
+Example responses:
+{"mdc_name": "draftr-link-updater.mdc", "confidence": 0.95, "reason": "Draftr link update", "variables": {"asset_id": "3934720", "new_url": "www.autodesk.com/uk/support", "link_text": "Get in touch", "operation": "change_specific"}}
+{"mdc_name": "draftr-link-updater.mdc", "confidence": 0.90, "reason": "Draftr bulk replace", "variables": {"asset_id": "123456", "old_url": "oldsite.com", "new_url": "newsite.com", "operation": "replace_all"}}
+{"mdc_name": "draftr-link-updater.mdc", "confidence": 0.88, "reason": "Draftr domain replace", "variables": {"asset_id": "789012", "old_domain": "/en/", "new_domain": "/uk/", "operation": "replace_domain"}}
+"""
+    
+    # Structured-output schema for the match response. Kept static: a new schema costs extra
+    # latency on first use, so the candidate names are not inlined as an enum.
+    _VARIABLE_KEYS = ('asset_id', 'new_url', 'link_text', 'old_url', 'old_domain', 'new_domain', 'operation')
+    _MATCH_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "mdc_match",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "mdc_name": {"type": "string"},
+                    "confidence": {"type": "number"},
+                    "reason": {"type": "string"},
+                    "variables": {
+                        "type": "object",
+                        "properties": {key: {"type": ["string", "null"]} for key in _VARIABLE_KEYS},
+                        "required": list(_VARIABLE_KEYS),
+                        "additionalProperties": False
+                    }
+                },
+                "required": ["mdc_name", "confidence", "reason", "variables"],
+                "additionalProperties": False
+            }
+        }
+    }
+    
+    # Max MDC files sent to the model; larger catalogs are pre-filtered by keyword score
+    MAX_PROMPT_CANDIDATES = 25
+    
+    # Structured "run mdc on ... asset ..." prompts route here without a model call when the
+    # regex extraction already has everything the operation needs
+    DETERMINISTIC_MDC = "draftr-link-updater.mdc"
+    # Built-in example prompts (the UI's example buttons) with a dedicated MDC file; exact
+    # prompt -> file name. Examples without one here still go through normal matching.
+    EXAMPLE_MATCHES = {
+        "Validate email links in Draftr content": "streamlit_integrated_smart_validation.mdc",
+    }
+    _OPERATION_REQUIRES = {
+        'change_specific': ('link_text', 'new_url'),
+        'replace_all': ('old_url', 'new_url'),
+        'replace_domain': ('old_domain', 'new_domain'),
+    }
+    
+    # Variable extraction patterns for _extract_variables_fallback, compiled once; first match wins.
+    # Patterns that only ever match where an earlier one in the same tuple already does
+    # (draftr/asset/N, links? to "..."/<...>, change link in "...") are left out.
+    _ASSET_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'asset[/:](\d+)',  # "asset/123456" or "asset:123456"
+        r'asset[=\s]+(\d+)',  # "asset=123456" or "asset 123456"
+        r'on\s+(\d{6,8})',  # "on 123456"
+    ))
+    # Target/destination URL: to "url", to <url>, links to "url"
+    _NEW_URL_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'to\s+"([^"]+)"',  # to "url"
+        r'to\s+<([^>]+)>',  # to <url>
+        r'to\s+["\']([^"\']+)["\']',  # to 'url' or to "url"
+        r'to\s+((?:https?://)?[a-z0-9.-]+\.[a-z]{2,}(?:/[\w./-]*)*)',  # to www.example.com/path
+    ))
+    # Text identifying which link to change: link in "text", change link in "<text>"
+    _LINK_TEXT_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'link\s+in\s+"([^"]+)"',  # link in "text"
+        r'link\s+in\s+<([^>]+)>',  # link in <text>
+        r'in\s+"([^"]+)"\s+(?:to|link)',  # in "text" to/link
+    ))
+    # Old URL pattern to replace: replace all "url", replace all domain "domain"
+    _OLD_URL_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'replace\s+all\s+"([^"]+)"\s+links',  # replace all "url" links
+        r'replace\s+all\s+<([^>]+)>\s+links',  # replace all <url> links
+        r'replace\s+all\s+domain\s+"([^"]+)"',  # replace all domain "domain"
+        r'replace\s+all\s+domain\s+<([^>]+)>',  # replace all domain <domain>
+    ))
+    _DOMAIN_RE = re.compile(r'domain\s+"([^"]+)"', re.IGNORECASE)
+    _NEW_DOMAIN_RE = re.compile(r'to\s+"([^"]+)".*domain', re.IGNORECASE)
+    
+    # AI routing decisions by prompt shape, so prompts differing only in IDs/URLs/quoted text skip the model
+    MATCH_CACHE_LIMIT = 256
+    _MATCH_CACHE_FILE = Path(".mdc_match_cache.json")
+    # Applied in order: quoted text, then URLs, then numbers, then whitespace runs
+    _TEMPLATE_SUBS = (
+        (re.compile(r'"[^"]*"|<[^>]*>'), '"<S>"'),
+        (re.compile(r'https?://\S+'), '<URL>'),
+        (re.compile(r'\d+'), '<N>'),
+        (re.compile(r'\s+'), ' '),
+    )
+    
     def __init__(self, api_key: Optional[str] = None):
+        # Keyword -> catalog positions, per catalog (name, description) tuple; reused across match calls
+        self._word_indexes = {}
+        # Cleared after the first 400 with the schema (older Azure api-versions, non-4o deployments)
+        self.structured_output = True
+        # MDC_MATCH_CACHE=0 sends every prompt to the model
+        self.use_match_cache = os.getenv("MDC_MATCH_CACHE", "1") != "0"
+        self._match_cache = self._load_match_cache() if self.use_match_cache else {}
+        
+        # The OpenAI/Azure client (and its Azure AD token fetch) is built on first use
+        self._api_key = api_key
+        self._client = None
+        self._client_built = False
+        self._client_lock = threading.Lock()
+        self.is_azure = False
+        self.api_key = None
+        self._model_or_deployment = None
+    
+    @property
+    def client(self):
+        """OpenAI/AzureOpenAI client, built on first access so page loads skip auth and TLS setup"""
+        if not self._client_built:
+            with self._client_lock:
+                if not self._client_built:
+                    self._init_client(self._api_key)
+                    # Deployment name for Azure, model name for standard OpenAI; fixed for the client's lifetime
+                    if self.is_azure:
+                        self._model_or_deployment = os.getenv("OPENAI_DEPLOYMENT_NAME", "gpt-4")
+                    else:
+                        self._model_or_deployment = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+                    self._client_built = True
+        return self._client
+    
+    def _init_client(self, api_key: Optional[str]):
+        """Build (or reuse the process-wide) chat client for the configured OPENAI_API_TYPE"""
         # Check authentication type
         api_type = os.getenv("OPENAI_API_TYPE", "").lower()
+        api_version = os.getenv("OPENAI_API_VERSION", "2024-02-15-preview")
+        endpoint = os.getenv("OPENAI_API_BASE")
         
         if api_type == "azure_ad":
             # Azure AD (Service Principal) Authentication
@@ -702,34 +1506,40 @@ class PromptProcessor:
                 
                 if not all([tenant_id, client_id, client_secret]):
                     st.error("Missing Azure AD credentials. Check AZURE_TENANT_ID, AZURE_CLIENT_ID, AZURE_CLIENT_SECRET")
-                    self.client = None
-                    self.is_azure = False
-                    self.api_key = None
                     return
                 
-                # Create Azure AD credential
-                credential = ClientSecretCredential(
-                    tenant_id=tenant_id.strip("'\""),
-                    client_id=client_id.strip("'\""),
-                    client_secret=client_secret.strip("'\"")
-                )
+                tenant_id = tenant_id.strip("'\"")
+                client_id = client_id.strip("'\"")
+                client_secret = client_secret.strip("'\"")
                 
-                # Get token for Azure OpenAI
-                token = credential.get_token("https://cognitiveservices.azure.com/.default")
+                def build():
+                    # Create Azure AD credential
+                    credential = ClientSecretCredential(
+                        tenant_id=tenant_id,
+                        client_id=client_id,
+                        client_secret=client_secret
+                    )
+                    
+                    # Fail fast on bad credentials; the token is cached process-wide
+                    _get_cached_aad_token(credential, tenant_id, client_id)
+                    
+                    # Initialize Azure OpenAI client with a token provider so the SDK
+                    # picks up refreshed tokens lazily instead of pinning one into api_key
+                    return AzureOpenAI(
+                        azure_ad_token_provider=lambda: _get_cached_aad_token(credential, tenant_id, client_id),
+                        api_version=api_version,
+                        azure_endpoint=endpoint
+                    )
                 
-                # Initialize Azure OpenAI client with token
-                self.client = AzureOpenAI(
-                    api_key=token.token,
-                    api_version=os.getenv("OPENAI_API_VERSION", "2024-02-15-preview"),
-                    azure_endpoint=os.getenv("OPENAI_API_BASE")
+                self._client = _shared_openai_client(
+                    _client_fingerprint(api_type, tenant_id, client_id, client_secret, api_version, endpoint), build
                 )
                 self.is_azure = True
                 self.api_key = "azure_ad_token"
-                self.credential = credential
                 
             except Exception as e:
                 st.error(f"Azure AD authentication failed: {str(e)}")
-                self.client = None
+                self._client = None
                 self.is_azure = False
                 self.api_key = None
                 
@@ -738,100 +1548,117 @@ class PromptProcessor:
             self.api_key = api_key or os.getenv("OPENAI_API_KEY")
             if self.api_key:
                 from openai import AzureOpenAI
-                self.client = AzureOpenAI(
-                    api_key=self.api_key,
-                    api_version=os.getenv("OPENAI_API_VERSION", "2024-02-15-preview"),
-                    azure_endpoint=os.getenv("OPENAI_API_BASE")
+                self._client = _shared_openai_client(
+                    _client_fingerprint(api_type, self.api_key, api_version, endpoint),
+                    lambda: AzureOpenAI(api_key=self.api_key, api_version=api_version, azure_endpoint=endpoint)
                 )
                 self.is_azure = True
-            else:
-                self.client = None
-                self.is_azure = False
         else:
             # Standard OpenAI
             self.api_key = api_key or os.getenv("OPENAI_API_KEY")
             if self.api_key:
-                self.client = OpenAI(api_key=self.api_key)
-                self.is_azure = False
-            else:
-                self.client = None
-                self.is_azure = False
+                from openai import OpenAI
+                self._client = _shared_openai_client(
+                    _client_fingerprint(api_type, self.api_key), lambda: OpenAI(api_key=self.api_key)
+                )
     
     def match_prompt_to_mdc(self, prompt: str, available_mdc: List[Dict]) -> Dict:
         """Match user prompt to the most appropriate MDC file"""
         
+        example_target = self.EXAMPLE_MATCHES.get(prompt.strip())
+        if example_target:
+            mdc_file = next((mdc for mdc in available_mdc if mdc['name'] == example_target), None)
+            if mdc_file is not None:
+                return {"mdc_file": mdc_file, "confidence": 1.0, "reason": "Built-in example", "parameters": {}}
+        
+        # Before self.client: an unambiguous prompt needs neither the model nor its (lazy) client
+        fallback_variables = self._extract_variables_fallback(prompt)
+        deterministic = self._deterministic_match(prompt, fallback_variables, available_mdc)
+        if deterministic is not None:
+            return deterministic
+        
         if not self.client:
             # Simple keyword matching fallback
             return self._simple_match(prompt, available_mdc)
         
-        # Use OpenAI to intelligently match prompt to MDC file
-        mdc_descriptions = "\n".join([
-            f"{i+1}. {mdc['name']}: {mdc['description']}"
-            for i, mdc in enumerate(available_mdc)
-        ])
+        # Keep the prompt size bounded as the MDC library grows
+        if len(available_mdc) > self.MAX_PROMPT_CANDIDATES:
+            scores = self._score_mdc_files(prompt, available_mdc)
+            ranked = sorted(range(len(available_mdc)), key=lambda i: -scores[i])
+            available_mdc = [available_mdc[i] for i in ranked[:self.MAX_PROMPT_CANDIDATES]]
         
-        system_prompt = f"""You are an automation assistant. Match user requests to available MDC automation files and extract variables.
-
-Available MDC files:
-{mdc_descriptions}
-
-Respond with JSON containing:
-- "mdc_index": index of best matching MDC file (0-based)
-- "confidence": confidence score 0-1
-- "reason": brief explanation
-- "variables": extracted variables from the prompt (e.g., asset_id, new_url, link_text)
-
-For Draftr automation prompts, extract these variables:
-- "asset_id": Draftr asset ID (from URL like draftr/asset/3934720)
-- "new_url": Target URL to update link to (from patterns like to "url" or to <url>)
-- "link_text": Text to identify specific link (from patterns like link in "text")
-- "old_url": Old URL pattern to replace (from patterns like replace all "url")
-- "old_domain": Old domain to replace (from patterns like domain "/en/")
-- "new_domain": New domain to use (from patterns like to "/uk/")
-- "operation": Type of operation (change_specific, replace_all, replace_domain)
-
-Supported prompt formats:
-1. run mdc on https://webpub.autodesk.com/draftr/asset/123456 and change link in "text" to "newurl.com"
-2. run mdc on URL https://webpub.autodesk.com/draftr/asset/123456 to replace all "oldurl.com" links to "newurl.com"
-3. run mdc on URL https://webpub.autodesk.com/draftr/asset/123456 to replace all domain "/en/" links to "/uk/"
-
-Example responses:
-{{"mdc_index": 0, "confidence": 0.95, "reason": "Draftr link update", "variables": {{"asset_id": "3934720", "new_url": "www.autodesk.com/uk/support", "link_text": "Get in touch", "operation": "change_specific"}}}}
-{{"mdc_index": 0, "confidence": 0.90, "reason": "Draftr bulk replace", "variables": {{"asset_id": "123456", "old_url": "oldsite.com", "new_url": "newsite.com", "operation": "replace_all"}}}}
-{{"mdc_index": 0, "confidence": 0.88, "reason": "Draftr domain replace", "variables": {{"asset_id": "789012", "old_domain": "/en/", "new_domain": "/uk/", "operation": "replace_domain"}}}}
-"""
+        # Use OpenAI to intelligently match prompt to MDC file; sorted so the list renders identically
+        mdc_descriptions = "\n".join(
+            f"- {name}: {description}"
+            for name, description in sorted((mdc['name'], mdc['description']) for mdc in available_mdc)
+        )
+        mdc_by_name = {mdc['name']: mdc for mdc in available_mdc}
+        
+        cache_key = self._template_key(prompt, mdc_by_name) if self.use_match_cache else None
+        cached = self._match_cache.get(cache_key) if cache_key else None
+        if cached is not None and cached['mdc_name'] in mdc_by_name:
+            # Same prompt shape already routed: reuse the decision, extract this prompt's variables locally
+            variables = fallback_variables
+            return {
+                "mdc_file": mdc_by_name[cached['mdc_name']],
+                "confidence": cached['confidence'],
+                "reason": cached['reason'],
+                "parameters": {"variables": variables} if variables else {}
+            }
         
         try:
-            # Use deployment name for Azure, model name for standard OpenAI
-            if self.is_azure:
-                model_or_deployment = os.getenv("OPENAI_DEPLOYMENT_NAME", "gpt-4")
-            else:
-                model_or_deployment = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+            model_or_deployment = self._model_or_deployment
             
-            response = self.client.chat.completions.create(
-                model=model_or_deployment,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=1024,
-                temperature=0.3
-            )
+            def complete(response_format):
+                return self.client.chat.completions.create(
+                    model=model_or_deployment,
+                    messages=[
+                        {"role": "system", "content": self._STATIC_PRELUDE},
+                        {"role": "system", "content": f"Available MDC files:\n{mdc_descriptions}"},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format=response_format,
+                    max_tokens=256,
+                    # Deterministic routing; also keeps template-cache entries consistent
+                    temperature=0.0,
+                    top_p=1.0,
+                    seed=0
+                )
+            
+            if self.structured_output:
+                try:
+                    response = complete(self._MATCH_RESPONSE_FORMAT)
+                except Exception as e:
+                    if getattr(e, 'status_code', None) != 400:
+                        raise
+                    log.info("Structured output rejected, falling back to json_object: %s", e)
+                    self.structured_output = False
+            if not self.structured_output:
+                response = complete({"type": "json_object"})
             
             response_text = response.choices[0].message.content
-            result = json.loads(response_text)
+            result = orjson.loads(response_text) if orjson else json.loads(response_text)
             
-            if result.get("mdc_index") is not None:
+            matched_mdc = mdc_by_name.get(result.get("mdc_name"))
+            if matched_mdc is not None:
                 # Extract variables, support both 'variables' and 'parameters' keys for backward compatibility
                 variables = result.get("variables", result.get("parameters", {}))
+                # The schema returns every key; unset ones come back null
+                variables = {k: v for k, v in (variables or {}).items() if v is not None}
                 
                 # If no variables extracted by AI, try regex fallback
                 if not variables:
-                    variables = self._extract_variables_fallback(prompt)
+                    variables = fallback_variables
+                
+                if cache_key:
+                    self._remember_match(cache_key, {
+                        "mdc_name": matched_mdc['name'],
+                        "confidence": result.get("confidence", 0.5),
+                        "reason": result.get("reason", "")
+                    })
                 
                 return {
-                    "mdc_file": available_mdc[result["mdc_index"]],
+                    "mdc_file": matched_mdc,
                     "confidence": result.get("confidence", 0.5),
                     "reason": result.get("reason", ""),
                     "parameters": {"variables": variables} if variables else {}
@@ -841,26 +1668,71 @@ Example responses:
         
         return self._simple_match(prompt, available_mdc)
     
+    def _deterministic_match(self, prompt: str, variables: Dict, available_mdc: List[Dict]) -> Optional[Dict]:
+        """Route fully specified "run mdc" prompts to DETERMINISTIC_MDC; None when the model is needed"""
+        if not prompt.lstrip().lower().startswith('run mdc'):
+            return None
+        required = self._OPERATION_REQUIRES.get(variables.get('operation'))
+        if not required or 'asset_id' not in variables or not all(variables.get(k) for k in required):
+            return None
+        mdc_file = next((mdc for mdc in available_mdc if mdc['name'] == self.DETERMINISTIC_MDC), None)
+        if mdc_file is None:
+            return None
+        return {
+            "mdc_file": mdc_file,
+            "confidence": 1.0,
+            "reason": "Deterministic regex match",
+            "parameters": {"variables": variables}
+        }
+    
+    def _template_key(self, prompt: str, mdc_by_name: Dict[str, Dict]) -> str:
+        """Structural key for a prompt: placeholders for variable parts, plus the candidate set"""
+        template = prompt
+        for rx, placeholder in self._TEMPLATE_SUBS:
+            template = rx.sub(placeholder, template)
+        catalog = zlib.crc32("\n".join(sorted(mdc_by_name)).encode())
+        return f"{catalog:08x}:{template.strip().lower()}"
+    
+    def _load_match_cache(self) -> Dict[str, Dict]:
+        """Load persisted routing decisions; a missing or corrupt file starts empty"""
+        try:
+            payload = self._MATCH_CACHE_FILE.read_bytes()
+            cache = orjson.loads(payload) if orjson else json.loads(payload)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _remember_match(self, key: str, decision: Dict):
+        """Record a routing decision, evicting the oldest past MATCH_CACHE_LIMIT, and persist it"""
+        with _match_cache_lock():
+            # Merge with what other sessions have written since this one loaded the file
+            merged = {**self._load_match_cache(), **self._match_cache}
+            merged.pop(key, None)
+            merged[key] = decision
+            while len(merged) > self.MATCH_CACHE_LIMIT:
+                del merged[next(iter(merged))]
+            self._match_cache = merged
+            try:
+                if orjson:
+                    payload = orjson.dumps(merged)
+                else:
+                    payload = json.dumps(merged, separators=(',', ':')).encode()
+                _atomic_write_bytes(self._MATCH_CACHE_FILE, payload)
+            except OSError as e:
+                log.debug("Could not persist match cache: %s", e)
+    
     def _simple_match(self, prompt: str, available_mdc: List[Dict]) -> Dict:
         """Simple keyword-based matching fallback"""
-        prompt_lower = prompt.lower()
-        
         best_match = None
         best_score = 0
         
-        for mdc in available_mdc:
-            score = 0
-            mdc_text = f"{mdc['name']} {mdc['description']}".lower()
-            
+        if available_mdc:
             # Count keyword matches
-            words = prompt_lower.split()
-            for word in words:
-                if len(word) > 3 and word in mdc_text:
-                    score += 1
-            
-            if score > best_score:
-                best_score = score
-                best_match = mdc
+            scores = self._score_mdc_files(prompt, available_mdc)
+            best_index = max(range(len(scores)), key=scores.__getitem__)
+            best_score = scores[best_index]
+            if best_score > 0:
+                best_match = available_mdc[best_index]
         
         # Extract variables using regex fallback
         variables = self._extract_variables_fallback(prompt)
@@ -872,6 +1744,30 @@ Example responses:
             "parameters": {"variables": variables} if variables else {}
         }
     
+    def _score_mdc_files(self, prompt: str, available_mdc: List[Dict]) -> List[int]:
+        """Keyword match score of the prompt against each MDC file"""
+        index = self._get_word_index(available_mdc)
+        scores = [0] * len(available_mdc)
+        for token in set(self._TOKEN_RE.findall(prompt.lower())):
+            for position in index.get(token, ()):
+                scores[position] += 1
+        return scores
+    
+    def _get_word_index(self, available_mdc: List[Dict]) -> Dict[str, List[int]]:
+        """Get (and memoize per catalog) the lowercased keyword -> MDC positions index"""
+        key = tuple((mdc['name'], mdc['description']) for mdc in available_mdc)
+        index = self._word_indexes.get(key)
+        if index is None:
+            index = {}
+            for position, (name, description) in enumerate(key):
+                for token in set(self._TOKEN_RE.findall(f"{name} {description}".lower())):
+                    index.setdefault(token, []).append(position)
+            # Full and pre-filtered catalogs alternate; a handful of entries covers both
+            if len(self._word_indexes) >= 4:
+                self._word_indexes.clear()
+            self._word_indexes[key] = index
+        return index
+    
     def _extract_variables_fallback(self, prompt: str) -> Dict:
         """Extract variables from prompt using regex patterns (fallback method)
         
@@ -881,87 +1777,66 @@ Example responses:
         3. run mdc on URL https://webpub.autodesk.com/draftr/asset/<assetID> to replace all domain "<domain>" links to "<new domain>"
         """
         variables = {}
+        # Lowercased once for keyword checks; the regexes still search the original so
+        # extracted values keep their case
+        lowered = prompt.lower()
+        # Keyword gates let prompts skip pattern groups that cannot match. IGNORECASE
+        # folds a few non-ASCII letters that str.lower() leaves alone, so only ASCII
+        # prompts are gated.
+        gated = prompt.isascii()
         
         # Extract asset ID - supports multiple formats
-        asset_patterns = [
-            r'asset[/:](\d+)',  # "asset/123456" or "asset:123456"
-            r'asset[=\s]+(\d+)',  # "asset=123456" or "asset 123456"
-            r'draftr/asset/(\d+)',  # Full URL "draftr/asset/123456"
-            r'on\s+(\d{6,8})',  # "on 123456"
-        ]
-        
-        for pattern in asset_patterns:
-            asset_match = re.search(pattern, prompt, re.IGNORECASE)
+        for rx in self._ASSET_PATTERNS:
+            asset_match = rx.search(prompt)
             if asset_match:
                 variables['asset_id'] = asset_match.group(1)
                 break
         
         # Extract "new link" URL - the target/destination URL
-        # Look for patterns like: to "url", to "<url>", links to "url"
-        new_url_patterns = [
-            r'to\s+"([^"]+)"',  # to "url"
-            r'to\s+<([^>]+)>',  # to <url>
-            r'to\s+["\']([^"\']+)["\']',  # to 'url' or to "url"
-            r'links?\s+to\s+"([^"]+)"',  # links to "url"
-            r'links?\s+to\s+<([^>]+)>',  # links to <url>
-            r'to\s+((?:https?://)?[a-z0-9.-]+\.[a-z]{2,}(?:/[\w./-]*)*)',  # to www.example.com/path
-        ]
-        
-        for pattern in new_url_patterns:
-            url_match = re.search(pattern, prompt, re.IGNORECASE)
+        for rx in self._NEW_URL_PATTERNS:
+            url_match = rx.search(prompt)
             if url_match:
                 url = url_match.group(1)
                 # Normalize URL (remove protocol if present)
-                url = re.sub(r'^https?://', '', url)
+                if url.startswith('https://'):
+                    url = url[8:]
+                elif url.startswith('http://'):
+                    url = url[7:]
                 variables['new_url'] = url
                 break
         
         # Extract "link text" - text to identify which link to change
-        # Formats: link in "text", change link in "<text>", "<text>"
-        link_text_patterns = [
-            r'link\s+in\s+"([^"]+)"',  # link in "text"
-            r'link\s+in\s+<([^>]+)>',  # link in <text>
-            r'change\s+link\s+in\s+"([^"]+)"',  # change link in "text"
-            r'in\s+"([^"]+)"\s+(?:to|link)',  # in "text" to/link
-        ]
-        
-        for pattern in link_text_patterns:
-            text_match = re.search(pattern, prompt, re.IGNORECASE)
+        for rx in self._LINK_TEXT_PATTERNS:
+            text_match = rx.search(prompt)
             if text_match:
                 variables['link_text'] = text_match.group(1)
                 break
         
         # Extract "links to replace" - old URL pattern to find and replace
-        # Formats: replace all "url", replace all domain "domain"
-        old_url_patterns = [
-            r'replace\s+all\s+"([^"]+)"\s+links',  # replace all "url" links
-            r'replace\s+all\s+<([^>]+)>\s+links',  # replace all <url> links
-            r'replace\s+all\s+domain\s+"([^"]+)"',  # replace all domain "domain"
-            r'replace\s+all\s+domain\s+<([^>]+)>',  # replace all domain <domain>
-        ]
-        
-        for pattern in old_url_patterns:
-            old_match = re.search(pattern, prompt, re.IGNORECASE)
-            if old_match:
-                variables['old_url'] = old_match.group(1)
-                break
-        
-        # Extract domain pattern (like "/en/", "/uk/", etc.)
-        domain_match = re.search(r'domain\s+"([^"]+)"', prompt, re.IGNORECASE)
-        if domain_match:
-            variables['old_domain'] = domain_match.group(1)
-            
-        # Extract new domain if replacing domains
-        new_domain_match = re.search(r'to\s+"([^"]+)".*domain', prompt, re.IGNORECASE)
-        if new_domain_match:
-            variables['new_domain'] = new_domain_match.group(1)
+        if not gated or 'replace' in lowered:
+            for rx in self._OLD_URL_PATTERNS:
+                old_match = rx.search(prompt)
+                if old_match:
+                    variables['old_url'] = old_match.group(1)
+                    break
+        
+        if not gated or 'domain' in lowered:
+            # Extract domain pattern (like "/en/", "/uk/", etc.)
+            domain_match = self._DOMAIN_RE.search(prompt)
+            if domain_match:
+                variables['old_domain'] = domain_match.group(1)
+                
+            # Extract new domain if replacing domains
+            new_domain_match = self._NEW_DOMAIN_RE.search(prompt)
+            if new_domain_match:
+                variables['new_domain'] = new_domain_match.group(1)
         
         # Detect operation type
-        if 'replace all' in prompt.lower():
+        if 'replace all' in lowered:
             variables['operation'] = 'replace_all'
-        elif 'change link in' in prompt.lower():
+        elif 'change link in' in lowered:
             variables['operation'] = 'change_specific'
-        elif 'domain' in prompt.lower():
+        elif 'domain' in lowered:
             variables['operation'] = 'replace_domain'
         
         return variables
@@ -970,12 +1845,274 @@ Example responses:
 def init_session_state():
     """Initialize session state variables"""
     if 'execution_history' not in st.session_state:
-        st.session_state.execution_history = []
+        st.session_state.execution_history = deque(maxlen=EXECUTION_HISTORY_LIMIT)
+    if 'recent_mdc' not in st.session_state:
+        # Most-recently-executed MDC file names, newest first
+        st.session_state.recent_mdc = []
     if 'mdc_executor' not in st.session_state:
         # Default to local directory, remote is optional
         st.session_state.mdc_executor = MDCExecutor()
-    if 'prompt_processor' not in st.session_state:
-        st.session_state.prompt_processor = PromptProcessor()
+    ensure_prompt_processor()
+
+
+def _credential_fingerprint() -> int:
+    """Hash of the env settings that determine how PromptProcessor authenticates"""
+    return hash((
+        os.getenv('OPENAI_API_TYPE'),
+        os.getenv('OPENAI_API_KEY'),
+        os.getenv('AZURE_TENANT_ID'),
+        os.getenv('AZURE_CLIENT_ID')
+    ))
+
+
+def ensure_prompt_processor(api_key: Optional[str] = None):
+    """(Re)build the session PromptProcessor only when credentials have changed"""
+    fingerprint = _credential_fingerprint()
+    if (
+        'prompt_processor' not in st.session_state
+        or st.session_state.get('prompt_processor_fingerprint') != fingerprint
+    ):
+        st.session_state.prompt_processor = PromptProcessor(api_key)
+        st.session_state.prompt_processor_fingerprint = fingerprint
+
+
+@dataclass(frozen=True)
+class EnvCredentials:
+    """AI/MCP configuration parsed from the environment"""
+    api_type: str
+    has_creds: bool
+    mcp_url: Optional[str]
+    deployment: str
+    endpoint: str
+    tenant_id: str
+    model: str
+    
+    @property
+    def mcp_configured(self) -> bool:
+        return bool(self.mcp_url)
+    
+    @classmethod
+    def from_env(cls) -> "EnvCredentials":
+        _get = os.environ.get
+        api_type = _get("OPENAI_API_TYPE", "").lower()
+        if api_type == "azure_ad":
+            has_creds = bool(_get("AZURE_TENANT_ID") and _get("AZURE_CLIENT_ID") and _get("AZURE_CLIENT_SECRET"))
+        else:
+            has_creds = bool(_get("OPENAI_API_KEY"))
+        return cls(
+            api_type=api_type,
+            has_creds=has_creds,
+            mcp_url=_get("MCP_SERVER_URL"),
+            deployment=_get("OPENAI_DEPLOYMENT_NAME", "gpt-4"),
+            endpoint=_get("OPENAI_API_BASE", "not-set"),
+            tenant_id=_get("AZURE_TENANT_ID", ""),
+            model=_get("OPENAI_MODEL", "gpt-4o-mini")
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def _credential_status() -> EnvCredentials:
+    """Parse credential env vars once per process; call _credential_status.clear() when config changes"""
+    return EnvCredentials.from_env()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _render_last_execution(timestamp: float, success: bool, prompt_preview: str,
+                           mdc_file: str, time_str: str) -> str:
+    """Markdown status card for the most recent execution"""
+    return "\n\n".join([
+        f"**Last Execution:** {'✅ Success' if success else '❌ Failed'}",
+        f"**Prompt:** {prompt_preview}",
+        f"**MDC File:** {mdc_file}",
+        f"**Time:** {time_str}"
+    ])
+
+
+def render_parameters(params: Dict):
+    """Show extracted parameters, using a plain code block for flat scalar variables"""
+    variables = params.get('variables', params)
+    if isinstance(variables, dict) and all(
+        isinstance(v, (str, int, float, bool)) or v is None for v in variables.values()
+    ):
+        st.code(json.dumps(params, indent=2), language='json')
+    else:
+        st.json(params)
+
+
+@st.fragment
+def render_status_panel():
+    """Execution + system status column; reruns on its own when its widgets change"""
+    st.header("📊 Execution Status")
+    
+    # Real-time status
+    if st.session_state.execution_history:
+        latest = st.session_state.execution_history[-1]
+        st.markdown(_render_last_execution(
+            latest['timestamp'],
+            latest['result']['success'],
+            latest['_prompt_preview'],
+            latest['mdc_file'],
+            latest['_time_str']
+        ))
+    else:
+        st.info("No executions yet. Enter a prompt to get started!")
+    
+    st.divider()
+    
+    # System status
+    st.subheader("🔧 System Status")
+    
+    # Check dependencies
+    deps = check_dependencies()
+    
+    # Check API credentials
+    cred_status = _credential_status()
+    mdc_count = len(get_cached_mdc_files())
+    
+    # Status summary in one placeholder; markdown is rebuilt only when a flag changes
+    status_key = (cred_status.has_creds, deps['npm_packages'], deps['playwright'],
+                  cred_status.mcp_configured, mdc_count)
+    if st.session_state.get('_last_status') != status_key:
+        api_status = "🟢 AI Connected" if cred_status.has_creds else "🟡 Fallback Mode"
+        npm_status = "🟢 Installed" if deps['npm_packages'] else "🟡 Missing"
+        playwright_status = "🟢 Ready" if deps['playwright'] else "🟡 Missing"
+        mcp_status = "🟢 Ready" if cred_status.mcp_configured else "🟢 Local"
+        st.session_state._last_status_md = "\n\n".join([
+            f"**AI Service:** {api_status}",
+            f"**NPM Packages:** {npm_status}",
+            f"**Playwright:** {playwright_status}",
+            f"**MCP Server:** {mcp_status}",
+            f"**MDC Files:** {mdc_count}"
+        ])
+        st.session_state._last_status = status_key
+    st.empty().markdown(st.session_state._last_status_md)
+    
+    # One stat of the marker per rerun, shared by both expanders below
+    playwright_marker_exists = _PLAYWRIGHT_MARKER.exists()
+    
+    # Add verification details in expander
+    with st.expander("🔍 Verify Installation Details"):
+        node_modules_path = _HERE / 'node_modules'
+        mcp_sdk_path = node_modules_path / '@modelcontextprotocol' / 'sdk'
+        
+        st.markdown("**File Checks:**")
+        st.text(f"{'✅' if node_modules_path.exists() else '❌'} node_modules/ directory")
+        st.text(f"{'✅' if mcp_sdk_path.exists() else '❌'} MCP SDK installed")
+        st.text(f"{'✅' if playwright_marker_exists else '❌'} .playwright_installed marker")
+        
+        if node_modules_path.exists():
+            try:
+                pkg_count = len([d for d in node_modules_path.iterdir() if d.is_dir()])
+                st.text(f"📦 {pkg_count} npm packages found")
+            except:
+                pass
+        
+        st.markdown("**Paths:**")
+        st.code(f"MCP SDK: {mcp_sdk_path}", language=None)
+        st.code(f"Playwright: {_PLAYWRIGHT_MARKER}", language=None)
+    
+    # Show setup button if dependencies missing OR force reinstall option
+    col_inst1, col_inst2 = st.columns([2, 1])
+    
+    with col_inst1:
+        if not deps['npm_packages'] or not deps['playwright']:
+            if st.button("🔧 Install Dependencies", type="primary", use_container_width=True):
+                with st.spinner("Installing dependencies... This may take 3-5 minutes..."):
+                    result = install_dependencies_if_needed()
+                
+                if result['success']:
+                    st.success(f"✅ {result['message']}")
+                    
+                    # Show installation details
+                    if result['details']:
+                        with st.expander("📋 Installation Details", expanded=True):
+                            for component, status in result['details'].items():
+                                st.write(f"**{component.replace('_', ' ').title()}:** {status}")
+                    
+                    # Show installation logs
+                    if result['logs']:
+                        with st.expander("📜 Installation Log"):
+                            st.code("\n".join(result['logs']), language="text")
+                    
+                    # Verify and show updated status
+                    st.info("🔄 Refreshing app to update status...")
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error(f"❌ {result['message']}")
+                    
+                    # Show what failed
+                    if result['logs']:
+                        with st.expander("📜 Error Details", expanded=True):
+                            st.code("\n".join(result['logs']), language="text")
+                    
+                    st.warning("💡 Try refreshing the page or check system requirements.")
+    
+    with col_inst2:
+        # Force reinstall option (delete marker file)
+        if deps['playwright']:
+            if st.button("🔄 Force Reinstall", use_container_width=True):
+                _clear_npm_sentinel()
+                if _PLAYWRIGHT_MARKER.exists():
+                    _PLAYWRIGHT_MARKER.unlink()
+                    check_dependencies.cache_clear()
+                    st.success("✅ Marker deleted. Click 'Install Dependencies' to reinstall.")
+                    st.rerun()
+    
+    # Check browser configuration
+    with st.expander("🔍 Browser Configuration Check"):
+        st.info("Using Chrome via channel (system Chrome installation)")
+        st.text("Browser: Google Chrome")
+        st.text("Channel: chrome")
+        st.text("Mode: Headless")
+        
+        # Check if playwright marker exists
+        if playwright_marker_exists:
+            st.success("✅ Playwright Chrome configured!")
+        else:
+            st.error("❌ Playwright not installed")
+            st.warning("Click 'Install Dependencies' or 'Force Reinstall' above.")
+
+
+@st.fragment
+def render_execution_history():
+    """Recent executions table and details; reruns on its own when its widgets change"""
+    # Recent execution history
+    if st.session_state.execution_history:
+        st.divider()
+        st.header("📜 Recent Executions")
+        
+        # Show last 5 executions as one table, with details for the selected one
+        recent_executions = list(islice(reversed(st.session_state.execution_history), 5))
+        st.dataframe(
+            [
+                {
+                    "status": execution['_status_icon'],
+                    "prompt": execution['_prompt_preview'],
+                    "mdc_file": execution['mdc_file'],
+                    "time": execution['_time_str']
+                }
+                for execution in recent_executions
+            ],
+            hide_index=True,
+            use_container_width=True,
+            key="history_df"
+        )
+        
+        selected = st.selectbox(
+            "View details",
+            range(len(recent_executions)),
+            format_func=lambda i: recent_executions[i]['_prompt_preview'],
+            key="history_select"
+        )
+        execution = recent_executions[selected]
+        succeeded = execution['result']['success']
+        st.markdown(f"**MDC File:** {execution['mdc_file']}\n\n**Prompt:** {execution['prompt']}")
+        
+        if succeeded:
+            st.code(execution['_output_preview'], language='text')
+        else:
+            st.error(execution['_error_preview'])
 
 
 def main():
@@ -992,20 +2129,9 @@ def main():
         st.header("⚙️ Configuration")
         
         # Check for pre-configured credentials
-        api_type = os.getenv("OPENAI_API_TYPE", "").lower()
-        
-        # Check if credentials are configured
-        has_credentials = False
-        if api_type == "azure_ad":
-            # Check Azure AD credentials
-            has_credentials = all([
-                os.getenv("AZURE_TENANT_ID"),
-                os.getenv("AZURE_CLIENT_ID"),
-                os.getenv("AZURE_CLIENT_SECRET")
-            ])
-        else:
-            # Check API key
-            has_credentials = bool(os.getenv("OPENAI_API_KEY"))
+        cred_status = _credential_status()
+        api_type = cred_status.api_type
+        has_credentials = cred_status.has_creds
         
         if has_credentials:
             # Credentials are pre-configured - no input needed!
@@ -1013,26 +2139,19 @@ def main():
             
             # Show appropriate authentication info
             if api_type == "azure_ad":
-                deployment = os.getenv("OPENAI_DEPLOYMENT_NAME", "gpt-4")
-                endpoint = os.getenv("OPENAI_API_BASE", "not-set")
-                tenant_id = os.getenv("AZURE_TENANT_ID", "")[:8]
                 st.caption(f"Using Azure OpenAI (Azure AD)")
-                st.caption(f"Deployment: {deployment}")
-                st.caption(f"Endpoint: {endpoint[:40]}...")
-                st.caption(f"Tenant: {tenant_id}...")
+                st.caption(f"Deployment: {cred_status.deployment}")
+                st.caption(f"Endpoint: {cred_status.endpoint[:40]}...")
+                st.caption(f"Tenant: {cred_status.tenant_id[:8]}...")
             elif api_type == "azure":
-                deployment = os.getenv("OPENAI_DEPLOYMENT_NAME", "gpt-4")
-                endpoint = os.getenv("OPENAI_API_BASE", "not-set")
                 st.caption(f"Using Azure OpenAI (API Key)")
-                st.caption(f"Deployment: {deployment}")
-                st.caption(f"Endpoint: {endpoint[:40]}...")
+                st.caption(f"Deployment: {cred_status.deployment}")
+                st.caption(f"Endpoint: {cred_status.endpoint[:40]}...")
             else:
-                model_name = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-                st.caption(f"Using OpenAI {model_name}")
+                st.caption(f"Using OpenAI {cred_status.model}")
             
-            # Initialize processor if not already done
-            if 'prompt_processor' not in st.session_state:
-                st.session_state.prompt_processor = PromptProcessor()
+            # Initialize processor if not already done (or credentials changed)
+            ensure_prompt_processor()
         else:
             # Fallback: Allow manual API key input (for local development)
             st.warning("⚠️ No API key configured")
@@ -1056,13 +2175,14 @@ def main():
                     
                     os.environ["OPENAI_API_KEY"] = api_key
                     os.environ["OPENAI_MODEL"] = model
-                    st.session_state.prompt_processor = PromptProcessor(api_key)
+                    _credential_status.clear()
+                    ensure_prompt_processor(api_key)
                     st.rerun()  # Refresh to show connected status
         
         # MDC Directory Configuration
         mdc_dir = st.text_input(
             "MDC Files Directory",
-            value=str(Path.cwd() / "mdc_files"),
+            value=str(_DEFAULT_MDC_DIR),
             help="Path to directory containing MDC files"
         )
         st.session_state.mdc_executor.mdc_directory = Path(mdc_dir)
@@ -1091,6 +2211,7 @@ def main():
                     with col1:
                         if st.button("🔄 Refresh from Server"):
                             st.session_state.mdc_executor.refresh_remote_files()
+                            _cached_available_mdc.clear()
                             st.success("Refreshed from server!")
                             st.rerun()
                     
@@ -1108,7 +2229,7 @@ def main():
         st.header("📁 Available Automations")
         
         with st.spinner("Loading MDC files..."):
-            available_mdc = st.session_state.mdc_executor.get_available_mdc_files()
+            available_mdc = get_cached_mdc_files()
         
         if available_mdc:
             # Show source indicator
@@ -1118,7 +2239,27 @@ def main():
             else:
                 st.info(f"💻 {len(available_mdc)} file(s) from local directory")
             
-            for mdc in available_mdc:
+            # One table for the whole catalog instead of an expander per file
+            st.dataframe(
+                [
+                    {
+                        "name": mdc['name'],
+                        "description": mdc['description'],
+                        "source": mdc.get('source', 'local')
+                    }
+                    for mdc in available_mdc
+                ],
+                hide_index=True,
+                use_container_width=True,
+                key="mdc_catalog_df"
+            )
+            
+            # Full details only for recently used automations
+            mdc_by_name = {mdc['name']: mdc for mdc in available_mdc}
+            for name in st.session_state.recent_mdc:
+                mdc = mdc_by_name.get(name)
+                if not mdc:
+                    continue
                 source_icon = "🌐" if mdc.get('source') == 'remote' else "💻"
                 with st.expander(f"{source_icon} {mdc['name']}"):
                     st.write(mdc['description'])
@@ -1136,7 +2277,7 @@ def main():
         if st.session_state.execution_history:
             st.metric("Total Executions", len(st.session_state.execution_history))
             if st.button("Clear History"):
-                st.session_state.execution_history = []
+                st.session_state.execution_history = deque(maxlen=EXECUTION_HISTORY_LIMIT)
                 st.rerun()
     
     # Main content area
@@ -1180,15 +2321,22 @@ def main():
         with col_btn2:
             analyze_btn = st.button("🔍 Analyze Only", use_container_width=True)
         
+        with col_btn3:
+            if st.button("🔑 Reload credentials", help="Re-read DRAFTR_COOKIES / AUTODESK_ACCESS_TOKEN from secrets"):
+                st.session_state.mdc_executor.reload_auth()
+                st.success("Credentials reloaded")
+        
         # Execute automation
         if execute_btn and user_prompt:
             # Check authentication status BEFORE execution
             auth_status = st.empty()
             auth_found = False
+            # Secrets snapshot parsed by the executor (cookies already decoded); see "Reload credentials"
+            auth = st.session_state.mdc_executor.auth_context
             
             try:
                 # Check for Persistent Browser Session (BEST for local!)
-                session_file = Path(__file__).parent / 'auth' / 'draftr-session.json'
+                session_file = _HERE / 'auth' / 'draftr-session.json'
                 if session_file.exists():
                     try:
                         with open(session_file, 'r') as f:
@@ -1200,13 +2348,12 @@ def main():
                         auth_status.warning(f"⚠️ Session file exists but couldn't be read: {e}")
                 
                 # Check for IDSDK OAuth Token (PREFERRED for cloud)
-                elif hasattr(st, 'secrets') and 'AUTODESK_ACCESS_TOKEN' in st.secrets:
-                    token = st.secrets['AUTODESK_ACCESS_TOKEN']
-                    token_expires_at = st.secrets.get('AUTODESK_TOKEN_EXPIRES_AT', 0)
+                elif auth['autodesk_token']:
+                    token_expires_at = auth['token_expires_at']
+                    now = time.time()
                     
-                    if token_expires_at and time.time() < token_expires_at:
-                        expires_in = int(token_expires_at - time.time())
-                        expires_min = expires_in // 60
+                    if token_expires_at and now < token_expires_at:
+                        expires_min = int(token_expires_at - now) // 60
                         auth_status.success(f"🔐 Authentication: IDSDK OAuth Token (expires in {expires_min} minutes)")
                         auth_found = True
                     else:
@@ -1215,9 +2362,8 @@ def main():
                         st.info("💡 Run: `python3 autodesk_idsdk_login.py`")
                 
                 # Check for Session Cookies (FALLBACK)
-                elif hasattr(st, 'secrets') and 'DRAFTR_COOKIES' in st.secrets:
-                    cookies_json = st.secrets['DRAFTR_COOKIES']
-                    cookies = json.loads(cookies_json)
+                elif auth['cookies']:
+                    cookies = auth['cookies']
                     auth_status.warning(f"🍪 Authentication: {len(cookies)} session cookies (consider upgrading to IDSDK)")
                     auth_found = True
                 
@@ -1260,7 +2406,7 @@ def main():
             
             with st.spinner("🔄 Processing your request..."):
                 # Get available MDC files
-                available_mdc = st.session_state.mdc_executor.get_available_mdc_files()
+                available_mdc = get_cached_mdc_files()
                 
                 if not available_mdc:
                     st.error("No MDC files found. Please add MDC files to the directory.")
@@ -1286,14 +2432,24 @@ def main():
                         with st.expander("🔍 Debug: Raw Result"):
                             st.json(result)
                         
-                        # Store in history
+                        # Store in history, with display strings computed once
+                        executed_at = time.time()
                         st.session_state.execution_history.append({
-                            "timestamp": time.time(),
+                            "timestamp": executed_at,
                             "prompt": user_prompt,
                             "mdc_file": match_result['mdc_file']['name'],
-                            "result": result
+                            "result": result,
+                            "_status_icon": '✅' if result['success'] else '❌',
+                            "_prompt_preview": f"{user_prompt[:50]}...",
+                            "_output_preview": (result.get('output') or '')[:500],
+                            "_error_preview": (result.get('error') or '')[:500],
+                            "_time_str": time.strftime('%H:%M:%S', time.localtime(executed_at))
                         })
                         
+                        # Track recently used MDC files for the sidebar
+                        recent = [n for n in st.session_state.recent_mdc if n != match_result['mdc_file']['name']]
+                        st.session_state.recent_mdc = [match_result['mdc_file']['name']] + recent[:RECENT_MDC_LIMIT - 1]
+                        
                         # Display results
                         if result['success']:
                             st.success("✅ Automation completed successfully!")
@@ -1323,7 +2479,7 @@ def main():
         # Analyze only (don't execute)
         elif analyze_btn and user_prompt:
             with st.spinner("🔍 Analyzing your request..."):
-                available_mdc = st.session_state.mdc_executor.get_available_mdc_files()
+                available_mdc = get_cached_mdc_files()
                 
                 if available_mdc:
                     match_result = st.session_state.prompt_processor.match_prompt_to_mdc(
@@ -1331,185 +2487,27 @@ def main():
                         available_mdc
                     )
                     
-                    st.markdown('<div class="info-box">', unsafe_allow_html=True)
-                    st.markdown(f"""
-                    **🎯 Matched MDC File:** {match_result['mdc_file']['name']}
-                    
-                    **📊 Confidence:** {match_result['confidence']:.0%}
-                    
-                    **💡 Reason:** {match_result['reason']}
-                    
-                    **📁 File Path:** `{match_result['mdc_file']['path']}`
-                    
-                    **📝 Description:** {match_result['mdc_file']['description']}
-                    """)
-                    
-                    if match_result['parameters']:
-                        st.markdown("**⚙️ Extracted Parameters:**")
-                        st.json(match_result['parameters'])
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.header("📊 Execution Status")
-        
-        # Real-time status
-        status_container = st.container()
-        
-        with status_container:
-            if st.session_state.execution_history:
-                latest = st.session_state.execution_history[-1]
-                
-                st.metric(
-                    "Last Execution",
-                    "Success" if latest['result']['success'] else "Failed",
-                    delta=None
-                )
-                
-                st.write(f"**Prompt:** {latest['prompt'][:50]}...")
-                st.write(f"**MDC File:** {latest['mdc_file']}")
-                st.write(f"**Time:** {time.strftime('%H:%M:%S', time.localtime(latest['timestamp']))}")
-            else:
-                st.info("No executions yet. Enter a prompt to get started!")
-        
-        st.divider()
-        
-        # System status
-        st.subheader("🔧 System Status")
-        
-        # Check dependencies
-        deps = check_dependencies()
-        
-        # Check API credentials
-        api_type = os.getenv("OPENAI_API_TYPE", "").lower()
-        if api_type == "azure_ad":
-            has_creds = all([os.getenv("AZURE_TENANT_ID"), os.getenv("AZURE_CLIENT_ID"), os.getenv("AZURE_CLIENT_SECRET")])
-        else:
-            has_creds = bool(os.getenv("OPENAI_API_KEY"))
-        
-        api_status = "🟢 AI Connected" if has_creds else "🟡 Fallback Mode"
-        st.write(f"**AI Service:** {api_status}")
-        
-        # NPM/Playwright status
-        npm_status = "🟢 Installed" if deps['npm_packages'] else "🟡 Missing"
-        playwright_status = "🟢 Ready" if deps['playwright'] else "🟡 Missing"
-        st.write(f"**NPM Packages:** {npm_status}")
-        st.write(f"**Playwright:** {playwright_status}")
-        
-        # Add verification details in expander
-        with st.expander("🔍 Verify Installation Details"):
-            node_modules_path = Path(__file__).parent / 'node_modules'
-            mcp_sdk_path = node_modules_path / '@modelcontextprotocol' / 'sdk'
-            playwright_marker = Path(__file__).parent / '.playwright_installed'
-            
-            st.markdown("**File Checks:**")
-            st.text(f"{'✅' if node_modules_path.exists() else '❌'} node_modules/ directory")
-            st.text(f"{'✅' if mcp_sdk_path.exists() else '❌'} MCP SDK installed")
-            st.text(f"{'✅' if playwright_marker.exists() else '❌'} .playwright_installed marker")
-            
-            if node_modules_path.exists():
-                try:
-                    pkg_count = len([d for d in node_modules_path.iterdir() if d.is_dir()])
-                    st.text(f"📦 {pkg_count} npm packages found")
-                except:
-                    pass
-            
-            st.markdown("**Paths:**")
-            st.code(f"MCP SDK: {mcp_sdk_path}", language=None)
-            st.code(f"Playwright: {playwright_marker}", language=None)
-        
-        # Show setup button if dependencies missing OR force reinstall option
-        col_inst1, col_inst2 = st.columns([2, 1])
-        
-        with col_inst1:
-            if not deps['npm_packages'] or not deps['playwright']:
-                if st.button("🔧 Install Dependencies", type="primary", use_container_width=True):
-                    with st.spinner("Installing dependencies... This may take 3-5 minutes..."):
-                        result = install_dependencies_if_needed()
-                    
-                    if result['success']:
-                        st.success(f"✅ {result['message']}")
+                    with st.container(border=True, key="analyze_result"):
+                        st.markdown(f"""
+                        **🎯 Matched MDC File:** {match_result['mdc_file']['name']}
                         
-                        # Show installation details
-                        if result['details']:
-                            with st.expander("📋 Installation Details", expanded=True):
-                                for component, status in result['details'].items():
-                                    st.write(f"**{component.replace('_', ' ').title()}:** {status}")
+                        **📊 Confidence:** {match_result['confidence']:.0%}
                         
-                        # Show installation logs
-                        if result['logs']:
-                            with st.expander("📜 Installation Log"):
-                                for log_line in result['logs']:
-                                    st.text(log_line)
+                        **💡 Reason:** {match_result['reason']}
                         
-                        # Verify and show updated status
-                        st.info("🔄 Refreshing app to update status...")
-                        time.sleep(1)
-                        st.rerun()
-                    else:
-                        st.error(f"❌ {result['message']}")
+                        **📁 File Path:** `{match_result['mdc_file']['path']}`
                         
-                        # Show what failed
-                        if result['logs']:
-                            with st.expander("📜 Error Details", expanded=True):
-                                for log_line in result['logs']:
-                                    st.text(log_line)
+                        **📝 Description:** {match_result['mdc_file']['description']}
+                        """)
                         
-                        st.warning("💡 Try refreshing the page or check system requirements.")
-        
-        with col_inst2:
-            # Force reinstall option (delete marker file)
-            if deps['playwright']:
-                if st.button("🔄 Force Reinstall", use_container_width=True):
-                    playwright_marker = Path(__file__).parent / '.playwright_installed'
-                    if playwright_marker.exists():
-                        playwright_marker.unlink()
-                        st.success("✅ Marker deleted. Click 'Install Dependencies' to reinstall.")
-                        st.rerun()
-        
-        # Check browser configuration
-        with st.expander("🔍 Browser Configuration Check"):
-            st.info("Using Chrome via channel (system Chrome installation)")
-            st.text("Browser: Google Chrome")
-            st.text("Channel: chrome")
-            st.text("Mode: Headless")
-            
-            # Check if playwright marker exists
-            playwright_marker = Path(__file__).parent / '.playwright_installed'
-            if playwright_marker.exists():
-                st.success("✅ Playwright Chrome configured!")
-            else:
-                st.error("❌ Playwright not installed")
-                st.warning("Click 'Install Dependencies' or 'Force Reinstall' above.")
-        
-        # Check MCP server
-        mcp_status = "🟢 Ready" if os.getenv("MCP_SERVER_URL") else "🟢 Local"
-        st.write(f"**MCP Server:** {mcp_status}")
-        
-        # MDC files count
-        mdc_count = len(st.session_state.mdc_executor.get_available_mdc_files())
-        st.write(f"**MDC Files:** {mdc_count}")
+                        if match_result['parameters']:
+                            st.markdown("**⚙️ Extracted Parameters:**")
+                            render_parameters(match_result['parameters'])
     
-    # Recent execution history
-    if st.session_state.execution_history:
-        st.divider()
-        st.header("📜 Recent Executions")
-        
-        # Show last 5 executions
-        for idx, execution in enumerate(reversed(st.session_state.execution_history[-5:])):
-            with st.expander(
-                f"{'✅' if execution['result']['success'] else '❌'} "
-                f"{execution['prompt'][:50]}... - "
-                f"{time.strftime('%H:%M:%S', time.localtime(execution['timestamp']))}"
-            ):
-                st.write(f"**MDC File:** {execution['mdc_file']}")
-                st.write(f"**Prompt:** {execution['prompt']}")
-                
-                if execution['result']['success']:
-                    st.code(execution['result']['output'][:500], language='text')
-                else:
-                    st.error(execution['result']['error'][:500])
-
+    with col2:
+        render_status_panel()
+    
+    render_execution_history()
 
 if __name__ == "__main__":
     main()
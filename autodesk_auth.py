@@ -11,9 +11,34 @@ import requests
 import streamlit as st
 from typing import Dict, Optional, Tuple
 import base64
+import functools
+import os
+import threading
 import time
 from urllib.parse import urlencode
 
+try:
+    import orjson  # Optional: faster JSON for token responses
+except ImportError:
+    orjson = None
+
+
+def _json(response) -> Dict:
+    """Decode a JSON response body, with orjson when it is installed"""
+    return orjson.loads(response.content) if orjson else response.json()
+
+
+@functools.lru_cache(maxsize=16)
+def _authorize_url_prefix(authorize_url: str, client_id: str, redirect_uri: str, scope: str) -> str:
+    """Encoded authorize URL up to the state parameter; only state changes between calls"""
+    params = {
+        'client_id': client_id,
+        'response_type': 'code',
+        'redirect_uri': redirect_uri,
+        'scope': scope
+    }
+    return f"{authorize_url}?{urlencode(params)}"
+
 
 class AutodeskOAuthClient:
     """
@@ -28,13 +53,15 @@ class AutodeskOAuthClient:
     TOKEN_URL = f"{AUTH_BASE}/token"
     AUTHORIZE_URL = f"{AUTH_BASE}/authorize"
     
-    def __init__(self, client_id: Optional[str] = None, client_secret: Optional[str] = None):
+    def __init__(self, client_id: Optional[str] = None, client_secret: Optional[str] = None,
+                 shared: bool = False):
         """
         Initialize Autodesk OAuth client
         
         Args:
             client_id: Autodesk app client ID
             client_secret: Autodesk app client secret
+            shared: Client is shared across sessions; user (3-legged) token calls raise
         """
         # Try to load from secrets if not provided
         self.client_id = client_id
@@ -50,10 +77,42 @@ class AutodeskOAuthClient:
                 "Add AUTODESK_CLIENT_ID and AUTODESK_CLIENT_SECRET to Streamlit secrets."
             )
         
+        # Basic Auth header for token calls; the credentials never change after init
+        credentials = f"{self.client_id}:{self.client_secret}"
+        self._basic_auth_header = f"Basic {base64.b64encode(credentials.encode()).decode()}"
+        
         # Token storage
         self.access_token = None
         self.refresh_token = None
         self.token_expires_at = None
+        self._session = None
+        self._refresh_lock = threading.Lock()
+        self._shared = shared
+        # (scope, access_token) of the last token served from the disk cache
+        self._persisted_token = None
+    
+    def _require_private(self, action: str) -> None:
+        """Refuse user token calls on a shared client, where the token would leak to other sessions"""
+        if self._shared:
+            raise RuntimeError(
+                f"Cannot {action} on the shared Autodesk client; "
+                "use setup_autodesk_oauth() or AutodeskOAuthClient() for per-user flows."
+            )
+    
+    def _get_session(self) -> requests.Session:
+        """Keep-alive session for token and API calls, so repeat calls skip the TCP/TLS handshake"""
+        if self._session is None:
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_maxsize=8,
+                max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+            )
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
     
     def get_authorization_url(self, redirect_uri: str, scope: str = "data:read data:write") -> Tuple[str, str]:
         """
@@ -69,15 +128,8 @@ class AutodeskOAuthClient:
         import secrets
         state = secrets.token_urlsafe(32)
         
-        params = {
-            'client_id': self.client_id,
-            'response_type': 'code',
-            'redirect_uri': redirect_uri,
-            'scope': scope,
-            'state': state
-        }
-        
-        auth_url = f"{self.AUTHORIZE_URL}?{urlencode(params)}"
+        # state is URL-safe, so only the fixed prefix needs encoding
+        auth_url = f"{_authorize_url_prefix(self.AUTHORIZE_URL, self.client_id, redirect_uri, scope)}&state={state}"
         return auth_url, state
     
     def exchange_code_for_token(self, code: str, redirect_uri: str) -> Dict:
@@ -91,12 +143,10 @@ class AutodeskOAuthClient:
         Returns:
             Token response with access_token, refresh_token, expires_in
         """
-        # Create Basic Auth header
-        credentials = f"{self.client_id}:{self.client_secret}"
-        b64_credentials = base64.b64encode(credentials.encode()).decode()
+        self._require_private("exchange an authorization code")
         
         headers = {
-            'Authorization': f'Basic {b64_credentials}',
+            'Authorization': self._basic_auth_header,
             'Content-Type': 'application/x-www-form-urlencoded'
         }
         
@@ -106,10 +156,10 @@ class AutodeskOAuthClient:
             'redirect_uri': redirect_uri
         }
         
-        response = requests.post(self.TOKEN_URL, headers=headers, data=data)
+        response = self._get_session().post(self.TOKEN_URL, headers=headers, data=data)
         response.raise_for_status()
         
-        token_data = response.json()
+        token_data = _json(response)
         
         # Store tokens
         self.access_token = token_data['access_token']
@@ -130,12 +180,8 @@ class AutodeskOAuthClient:
         Returns:
             Token response with access_token and expires_in
         """
-        # Create Basic Auth header
-        credentials = f"{self.client_id}:{self.client_secret}"
-        b64_credentials = base64.b64encode(credentials.encode()).decode()
-        
         headers = {
-            'Authorization': f'Basic {b64_credentials}',
+            'Authorization': self._basic_auth_header,
             'Content-Type': 'application/x-www-form-urlencoded'
         }
         
@@ -144,10 +190,10 @@ class AutodeskOAuthClient:
             'scope': scope
         }
         
-        response = requests.post(self.TOKEN_URL, headers=headers, data=data)
+        response = self._get_session().post(self.TOKEN_URL, headers=headers, data=data)
         response.raise_for_status()
         
-        token_data = response.json()
+        token_data = _json(response)
         
         # Store token
         self.access_token = token_data['access_token']
@@ -162,15 +208,12 @@ class AutodeskOAuthClient:
         Returns:
             New token response
         """
+        self._require_private("refresh a user token")
         if not self.refresh_token:
             raise ValueError("No refresh token available")
         
-        # Create Basic Auth header
-        credentials = f"{self.client_id}:{self.client_secret}"
-        b64_credentials = base64.b64encode(credentials.encode()).decode()
-        
         headers = {
-            'Authorization': f'Basic {b64_credentials}',
+            'Authorization': self._basic_auth_header,
             'Content-Type': 'application/x-www-form-urlencoded'
         }
         
@@ -179,10 +222,10 @@ class AutodeskOAuthClient:
             'refresh_token': self.refresh_token
         }
         
-        response = requests.post(self.TOKEN_URL, headers=headers, data=data)
+        response = self._get_session().post(self.TOKEN_URL, headers=headers, data=data)
         response.raise_for_status()
         
-        token_data = response.json()
+        token_data = _json(response)
         
         # Update tokens
         self.access_token = token_data['access_token']
@@ -199,23 +242,52 @@ class AutodeskOAuthClient:
         Returns:
             Valid access token string
         """
-        # Check if token exists and is not expired
-        if self.access_token and self.token_expires_at:
-            # Refresh if expiring in next 5 minutes
-            if time.time() < (self.token_expires_at - 300):
-                return self.access_token
+        if self._token_is_fresh():
+            return self.access_token
         
-        # Try to refresh if we have a refresh token
-        if self.refresh_token:
-            try:
-                self.refresh_access_token()
+        # Single-flight: concurrent callers wait for one refresh instead of each hitting /token
+        with self._refresh_lock:
+            if self._token_is_fresh():
                 return self.access_token
-            except Exception:
-                pass
+            
+            # Try to refresh if we have a refresh token
+            if self.refresh_token:
+                try:
+                    self.refresh_access_token()
+                    return self.access_token
+                except Exception:
+                    pass
+            
+            # Fall back to client credentials
+            self.load_client_credentials_token()
+            return self.access_token
+    
+    def _token_is_fresh(self) -> bool:
+        """Check the token exists and is not expiring in the next 5 minutes"""
+        return bool(self.access_token and self.token_expires_at
+                    and time.time() < (self.token_expires_at - 300))
+    
+    def load_client_credentials_token(self, scope: str = "data:read data:write") -> None:
+        """
+        Get a client credentials token, reusing one persisted by an earlier process
+        
+        Tokens are kept in Streamlit's disk cache keyed by (client_id, scope) until
+        5 minutes before expiry. Set AUTODESK_TOKEN_DISK_CACHE=0 to keep them in memory only.
         
-        # Fall back to client credentials
-        self.get_token_with_client_credentials()
-        return self.access_token
+        Args:
+            scope: OAuth scopes to request
+        """
+        if os.getenv("AUTODESK_TOKEN_DISK_CACHE", "1") == "0":
+            self.get_token_with_client_credentials(scope=scope)
+            return
+        
+        token = _persisted_client_token(self.client_id, scope, self)
+        if time.time() >= token['expires_at'] - 300:
+            _persisted_client_token.clear(self.client_id, scope, self)
+            token = _persisted_client_token(self.client_id, scope, self)
+        self.access_token = token['access_token']
+        self.token_expires_at = token['expires_at']
+        self._persisted_token = (scope, token['access_token'])
     
     def make_authenticated_request(self, url: str, method: str = 'GET', **kwargs) -> requests.Response:
         """
@@ -235,7 +307,18 @@ class AutodeskOAuthClient:
         headers = kwargs.pop('headers', {})
         headers['Authorization'] = f'Bearer {token}'
         
-        response = requests.request(method, url, headers=headers, **kwargs)
+        response = self._get_session().request(method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            # Token revoked or expired early; drop it (and its persisted entry, if it came from one)
+            # and retry once. Skip the drop if another thread already replaced the token.
+            with self._refresh_lock:
+                if self.access_token == token:
+                    self.access_token = None
+                    if self._persisted_token and self._persisted_token[1] == token:
+                        _persisted_client_token.clear(self.client_id, self._persisted_token[0], self)
+                        self._persisted_token = None
+            headers['Authorization'] = f'Bearer {self.get_valid_token()}'
+            response = self._get_session().request(method, url, headers=headers, **kwargs)
         response.raise_for_status()
         
         return response
@@ -243,6 +326,28 @@ class AutodeskOAuthClient:
 
 # Streamlit integration functions
 
+@st.cache_data(persist="disk", show_spinner=False)
+def _persisted_client_token(client_id: str, scope: str, _client: AutodeskOAuthClient) -> Dict:
+    """
+    Client credentials token persisted across restarts
+    
+    persist="disk" ignores ttl, so callers check 'expires_at' and clear() stale entries.
+    """
+    _client.get_token_with_client_credentials(scope=scope)
+    return {'access_token': _client.access_token, 'expires_at': _client.token_expires_at}
+
+
+@st.cache_resource(show_spinner=False)
+def _get_oauth_client() -> AutodeskOAuthClient:
+    """
+    Shared 2-legged OAuth client built from Streamlit secrets
+    
+    One instance per process, so its client credentials token survives reruns and sessions.
+    It refuses user (3-legged) token calls. Raises ValueError (not cached) when credentials are missing.
+    """
+    return AutodeskOAuthClient(shared=True)
+
+
 def setup_autodesk_oauth() -> Optional[AutodeskOAuthClient]:
     """
     Setup Autodesk OAuth client for Streamlit app
@@ -277,14 +382,15 @@ def get_autodesk_token_for_draftr() -> Optional[str]:
     """
     Get valid Autodesk access token for Draftr requests
     
+    Reuses the shared client's token until 5 minutes before it expires.
+    
     Returns:
         Access token string or None if not available
     """
     try:
-        client = AutodeskOAuthClient()
-        # Use client credentials (2-legged) for server-to-server
-        client.get_token_with_client_credentials(scope="data:read data:write")
-        return client.access_token
+        client = _get_oauth_client()
+        # Falls back to client credentials (2-legged) for server-to-server
+        return client.get_valid_token()
     except Exception as e:
         st.error(f"❌ Failed to get Autodesk token: {e}")
         return None
@@ -13,10 +13,26 @@ Flow:
 
 import subprocess
 import json
+import logging
+import threading
 import time
-from typing import Optional, Dict
+from functools import cached_property
+from typing import Optional, Dict, Iterator, Union
 import streamlit as st
 
+try:
+    import orjson  # Optional: faster JSON for token responses
+except ImportError:
+    orjson = None
+
+# Child of the app's "mdc" logger, so records share its handler and level
+log = logging.getLogger("mdc.auth")
+
+
+def _json(response) -> Dict:
+    """Decode a JSON response body, with orjson when it is installed"""
+    return orjson.loads(response.content) if orjson else response.json()
+
 
 class AutodeskIDSDKAuth:
     """
@@ -32,6 +48,36 @@ class AutodeskIDSDKAuth:
         self.refresh_token = None
         self.token_expires_at = None
         self.user_info = None
+        self._session = None
+        self._refresh_lock = threading.Lock()
+    
+    @cached_property
+    def _client_id(self) -> str:
+        """AUTODESK_CLIENT_ID from secrets, read once per client"""
+        if not hasattr(st, 'secrets') or 'AUTODESK_CLIENT_ID' not in st.secrets:
+            raise ValueError("AUTODESK_CLIENT_ID not found in secrets")
+        return st.secrets['AUTODESK_CLIENT_ID']
+    
+    @cached_property
+    def _client_secret(self) -> str:
+        """AUTODESK_CLIENT_SECRET from secrets (may be empty), read once per client"""
+        return st.secrets.get('AUTODESK_CLIENT_SECRET', '')
+    
+    def _get_session(self):
+        """Keep-alive session for device-flow polling and refreshes, reusing one TLS connection"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_maxsize=8,
+                max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+            )
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
     
     def login_interactive(self) -> Dict:
         """
@@ -56,24 +102,37 @@ class AutodeskIDSDKAuth:
         # Use Autodesk's OAuth flow
         # This is equivalent to idsdk_login() but in Python
         token_data = self._oauth_device_flow()
-        
-        # Store tokens
-        self.access_token = token_data['access_token']
-        self.refresh_token = token_data.get('refresh_token')
-        self.token_expires_at = time.time() + token_data['expires_in']
+        self._store_tokens(token_data)
         
         print("✅ Login complete!")
         print(f"   Token expires in: {token_data['expires_in']} seconds")
         
         return token_data
     
+    def _store_tokens(self, token_data: Dict) -> None:
+        """Keep the tokens from a completed login"""
+        self.access_token = token_data['access_token']
+        self.refresh_token = token_data.get('refresh_token')
+        self.token_expires_at = time.time() + token_data['expires_in']
+    
     def _oauth_device_flow(self) -> Dict:
         """
         Implement OAuth device flow for interactive login
         
         Similar to idsdk_login() - launches browser for user authentication
         """
-        import requests
+        for event in self._oauth_device_flow_iter():
+            if isinstance(event, dict):
+                return event
+        raise TimeoutError("Login timeout - user did not complete authentication")
+    
+    def _oauth_device_flow_iter(self) -> Iterator[Union[str, Dict]]:
+        """
+        OAuth device flow as a generator, for callers that show live progress
+        
+        Yields status strings while waiting for the user, then the token dict.
+        Raises TimeoutError if the device code expires first.
+        """
         import webbrowser
         
         # Autodesk OAuth endpoints
@@ -81,13 +140,10 @@ class AutodeskIDSDKAuth:
         token_url = "https://developer.api.autodesk.com/authentication/v2/token"
         
         # Get client credentials from secrets
-        if not hasattr(st, 'secrets') or 'AUTODESK_CLIENT_ID' not in st.secrets:
-            raise ValueError("AUTODESK_CLIENT_ID not found in secrets")
-        
-        client_id = st.secrets['AUTODESK_CLIENT_ID']
+        client_id = self._client_id
         
         # Step 1: Request device code
-        device_response = requests.post(
+        device_response = self._get_session().post(
             device_url,
             data={
                 'client_id': client_id,
@@ -95,7 +151,7 @@ class AutodeskIDSDKAuth:
             }
         )
         device_response.raise_for_status()
-        device_data = device_response.json()
+        device_data = _json(device_response)
         
         # Step 2: Display user code and open browser
         print(f"\n📋 User Code: {device_data['user_code']}")
@@ -107,16 +163,22 @@ class AutodeskIDSDKAuth:
         webbrowser.open(verification_url)
         print(f"\n🌐 Browser opened: {verification_url}")
         print("   Please complete login in the browser...")
+        log.info("Device login started; code expires in %ss", device_data['expires_in'])
+        yield (f"📋 User Code: {device_data['user_code']} - "
+               f"complete login at {device_data['verification_uri']}")
         
         # Step 3: Poll for token
         device_code = device_data['device_code']
         interval = device_data['interval']
         expires_at = time.time() + device_data['expires_in']
+        # Back off while the user is still logging in; never below the server's interval
+        poll_interval = interval
+        waiting = False
         
         while time.time() < expires_at:
-            time.sleep(interval)
+            time.sleep(min(poll_interval, max(0, expires_at - time.time())))
             
-            token_response = requests.post(
+            token_response = self._get_session().post(
                 token_url,
                 data={
                     'client_id': client_id,
@@ -127,18 +189,28 @@ class AutodeskIDSDKAuth:
             
             if token_response.status_code == 200:
                 # Success! User completed login
-                return token_response.json()
+                log.info("Device login complete")
+                yield _json(token_response)
+                return
             elif token_response.status_code == 400:
-                error = token_response.json().get('error')
+                error = _json(token_response).get('error')
                 if error == 'authorization_pending':
-                    # Still waiting for user
-                    print(".", end="", flush=True)
+                    # Still waiting for user; log the transition, not every poll
+                    if not waiting:
+                        log.info("Waiting for the user to complete device login")
+                        waiting = True
+                    remaining = int(max(0, expires_at - time.time()))
+                    yield f"⏳ Waiting for login in the browser... ({remaining}s left)"
+                    poll_interval = min(poll_interval * 1.5, interval * 4)
                     continue
                 elif error == 'slow_down':
                     # Increase polling interval
                     interval += 5
+                    poll_interval = max(poll_interval, interval)
+                    log.info("Device login polling slowed to every %ss", interval)
                     continue
                 else:
+                    log.warning("Device login failed: %s", error)
                     raise Exception(f"Login failed: {error}")
         
         raise TimeoutError("Login timeout - user did not complete authentication")
@@ -151,13 +223,12 @@ class AutodeskIDSDKAuth:
             Access token string or None if not logged in
         """
         if not self.access_token:
-            print("❌ No token available - user not logged in")
-            print("   Call login_interactive() first")
+            log.warning("No token available - user not logged in; call login_interactive() first")
             return None
         
         # Check if token is expired
         if self.token_expires_at and time.time() >= self.token_expires_at:
-            print("⚠️  Token expired, refreshing...")
+            log.info("Token expired, refreshing")
             self.refresh_token_if_needed()
         
         return self.access_token
@@ -170,40 +241,44 @@ class AutodeskIDSDKAuth:
             True if refresh successful, False otherwise
         """
         if not self.refresh_token:
-            print("❌ No refresh token available")
+            log.warning("No refresh token available")
             return False
         
+        # Single-flight: concurrent callers wait for one refresh instead of each hitting /token
+        with self._refresh_lock:
+            if self.access_token and self.token_expires_at and time.time() < self.token_expires_at:
+                # Another caller refreshed while we waited
+                return True
+            return self._refresh_access_token()
+    
+    def _refresh_access_token(self) -> bool:
+        """POST the refresh grant and store the new tokens; caller holds _refresh_lock"""
         try:
-            import requests
-            
             token_url = "https://developer.api.autodesk.com/authentication/v2/token"
-            client_id = st.secrets['AUTODESK_CLIENT_ID']
-            client_secret = st.secrets.get('AUTODESK_CLIENT_SECRET', '')
-            
-            response = requests.post(
+            response = self._get_session().post(
                 token_url,
                 data={
-                    'client_id': client_id,
-                    'client_secret': client_secret,
+                    'client_id': self._client_id,
+                    'client_secret': self._client_secret,
                     'grant_type': 'refresh_token',
                     'refresh_token': self.refresh_token
                 }
             )
             
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = _json(response)
                 self.access_token = token_data['access_token']
                 if 'refresh_token' in token_data:
                     self.refresh_token = token_data['refresh_token']
                 self.token_expires_at = time.time() + token_data['expires_in']
-                print("✅ Token refreshed successfully")
+                log.info("Token refreshed")
                 return True
             else:
-                print(f"❌ Token refresh failed: {response.status_code}")
+                log.warning("Token refresh failed: HTTP %s", response.status_code)
                 return False
                 
         except Exception as e:
-            print(f"❌ Token refresh error: {e}")
+            log.warning("Token refresh error: %s", e)
             return False
     
     def is_logged_in(self) -> bool:
@@ -266,8 +341,16 @@ def streamlit_idsdk_login() -> Optional[AutodeskIDSDKAuth]:
     st.info("   Complete login (SSO/2FA supported)")
     
     try:
-        with st.spinner("Waiting for login..."):
-            token_data = auth.login_interactive()
+        # Show each polling tick instead of a spinner that is silent for minutes
+        status = st.empty()
+        token_data = None
+        for event in auth._oauth_device_flow_iter():
+            if isinstance(event, dict):
+                token_data = event
+            else:
+                status.text(event)
+        status.empty()
+        auth._store_tokens(token_data)
         
         st.success("✅ Login successful!")
         st.success(f"   Token valid for {token_data['expires_in']} seconds")
@@ -285,6 +368,21 @@ def streamlit_idsdk_login() -> Optional[AutodeskIDSDKAuth]:
         return None
 
 
+@st.cache_resource(show_spinner=False)
+def _get_idsdk_auth(access_token: str) -> AutodeskIDSDKAuth:
+    """
+    Shared IDSDK client for the token saved in secrets
+    
+    Keyed by the saved access token, so refreshed tokens are kept across reruns
+    and sessions until a new token is saved to secrets.
+    """
+    auth = AutodeskIDSDKAuth()
+    auth.access_token = access_token
+    auth.refresh_token = st.secrets.get('AUTODESK_REFRESH_TOKEN')
+    auth.token_expires_at = st.secrets.get('AUTODESK_TOKEN_EXPIRES_AT', 0)
+    return auth
+
+
 def load_token_from_secrets() -> Optional[AutodeskIDSDKAuth]:
     """
     Load saved token from Streamlit secrets
@@ -298,10 +396,7 @@ def load_token_from_secrets() -> Optional[AutodeskIDSDKAuth]:
     if 'AUTODESK_ACCESS_TOKEN' not in st.secrets:
         return None
     
-    auth = AutodeskIDSDKAuth()
-    auth.access_token = st.secrets['AUTODESK_ACCESS_TOKEN']
-    auth.refresh_token = st.secrets.get('AUTODESK_REFRESH_TOKEN')
-    auth.token_expires_at = st.secrets.get('AUTODESK_TOKEN_EXPIRES_AT', 0)
+    auth = _get_idsdk_auth(st.secrets['AUTODESK_ACCESS_TOKEN'])
     
     # Check if token is still valid
     if auth.is_logged_in():
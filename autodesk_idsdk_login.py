@@ -18,6 +18,11 @@ What it does:
 import sys
 import os
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -38,12 +43,10 @@ def main():
     if os.path.exists(secrets_path):
         print(f"   Found secrets file: {secrets_path}")
         try:
-            with open(secrets_path, 'r') as f:
-                for line in f:
-                    if line.strip().startswith('AUTODESK_CLIENT_ID'):
-                        client_id = line.split('=')[1].strip().strip('"\'')
-                        print(f"   ✅ Client ID found: {client_id[:20]}...")
-                        break
+            with open(secrets_path, 'rb') as f:
+                client_id = tomllib.load(f).get('AUTODESK_CLIENT_ID')
+            if client_id:
+                print(f"   ✅ Client ID found: {client_id[:20]}...")
         except Exception as e:
             print(f"   ⚠️  Could not read secrets: {e}")
     
@@ -7,22 +7,71 @@ if it exists. Actual implementation depends on Draftr's real API structure.
 Security: API tokens stored in Streamlit secrets (more secure than cookies)
 """
 
+import functools
+import gzip
+import hashlib
+import itertools
+import json
+import re
+import threading
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import streamlit as st
 
+try:
+    import ijson  # Optional: incremental parsing of large link listings
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: faster JSON for link listings and update bodies
+except ImportError:
+    orjson = None
+
+
+def _json(response) -> Dict:
+    """Decode a JSON response body, with orjson when it is installed"""
+    return orjson.loads(response.content) if orjson else response.json()
+
+
+# (api key digest, links URL, query) -> (ETag, links); module-level so it survives reruns
+_LINKS_ETAG_CACHE: Dict[Tuple[str, str, Tuple], Tuple[str, List[Dict]]] = {}
+LINKS_ETAG_CACHE_LIMIT = 128
+
+
+@functools.lru_cache(maxsize=32)
+def _domains_pattern(domains: Tuple[str, ...]) -> re.Pattern:
+    """One alternation over literal domains, longest first so overlapping prefixes match fully"""
+    return re.compile('|'.join(map(re.escape, sorted(domains, key=len, reverse=True))))
+
 
 class DraftrAPIClient:
     """Client for interacting with Draftr API"""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    # Concurrent PATCH requests for bulk link updates
+    MAX_PARALLEL_UPDATES = 8
+    
+    # Request bodies at least this large are sent gzip-compressed
+    GZIP_MIN_BYTES = 1024
+    
+    # Links requested per page when the server paginates listings
+    LINKS_PAGE_SIZE = 500
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_workers: Optional[int] = None):
         """
         Initialize Draftr API client
         
         Args:
             api_key: Draftr API key (or loaded from secrets)
             base_url: Draftr API base URL (default: https://api.webpub.autodesk.com/draftr)
+            max_workers: Concurrent PATCHes for bulk updates (default: MAX_PARALLEL_UPDATES);
+                lower it to stay under Draftr's rate limits
         """
+        self.max_workers = max_workers or self.MAX_PARALLEL_UPDATES
         # Get API key from secrets if not provided
         self.api_key = api_key
         if not self.api_key and hasattr(st, 'secrets') and 'DRAFTR_API_KEY' in st.secrets:
@@ -38,6 +87,44 @@ class DraftrAPIClient:
             'Content-Type': 'application/json',
             'Accept': 'application/json'
         })
+        # Pool at least as wide as the PATCH fan-out so workers never discard connections;
+        # retries hand back the last response so raise_for_status() still raises HTTPError
+        adapter = HTTPAdapter(
+            pool_maxsize=max(10, self.max_workers),
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=["GET", "PATCH", "POST"], raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        # Scopes cached link listings to this API key without keeping the key itself
+        self._cache_scope = hashlib.sha256(self.api_key.encode()).hexdigest()[:16]
+        # Cleared once the server answers the bulk links endpoint with 405/501 (not supported)
+        self._bulk_supported = True
+        # asset_id -> (listing, casefolded link text -> first link with that text)
+        self._links_index_cache: Dict[str, Tuple[List[Dict], Dict[str, Dict]]] = {}
+        
+        # Resolve DNS and finish the TLS handshake before the first user action needs them
+        threading.Thread(target=self._warm_up, name="draftr-warm-up", daemon=True).start()
+    
+    def _warm_up(self) -> None:
+        """Open one pooled connection to the API host; best effort, failures are ignored"""
+        try:
+            self.session.head(self.base_url, timeout=2).close()
+        except Exception:
+            pass
+    
+    def _send_json(self, method: str, url: str, data: Dict,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Send a JSON body, gzip-compressed once it is large enough to be worth it
+        
+        Responses are already negotiated compressed: requests sends
+        Accept-Encoding: gzip, deflate and decodes transparently.
+        """
+        body = orjson.dumps(data) if orjson else json.dumps(data).encode()
+        if len(body) >= self.GZIP_MIN_BYTES:
+            body = gzip.compress(body)
+            headers = {**(headers or {}), 'Content-Encoding': 'gzip'}
+        return self.session.request(method, url, data=body, headers=headers)
     
     def get_asset(self, asset_id: str) -> Dict:
         """
@@ -52,24 +139,130 @@ class DraftrAPIClient:
         url = f"{self.base_url}/assets/{asset_id}"
         response = self.session.get(url)
         response.raise_for_status()
-        return response.json()
+        return _json(response)
     
-    def get_asset_links(self, asset_id: str) -> List[Dict]:
+    def get_asset_links(self, asset_id: str, text: Optional[str] = None, url: Optional[str] = None,
+                        url_contains: Optional[str] = None, fields: Optional[str] = 'id,url,text,etag') -> List[Dict]:
         """
-        Get all links in an asset
+        Get links in an asset, filtered server-side when filters are given
+        
+        Filters only narrow what is transferred; callers still check each link,
+        since a server that ignores them returns the full list. Paginated listings
+        are followed to the end.
         
         Args:
             asset_id: Draftr asset ID
+            text: Only links with this text
+            url: Only links with exactly this URL
+            url_contains: Only links whose URL contains this substring
+            fields: Comma-separated link fields to return (None for all)
             
         Returns:
             List of links with their IDs, URLs, and text
         """
-        url = f"{self.base_url}/assets/{asset_id}/links"
-        response = self.session.get(url)
+        pages = list(self.iter_link_pages(asset_id, text=text, url=url, url_contains=url_contains, fields=fields))
+        # A single page is returned as-is so ETag hits keep handing back the same list
+        return pages[0] if len(pages) == 1 else [link for page in pages for link in page]
+    
+    def iter_link_pages(self, asset_id: str, text: Optional[str] = None, url: Optional[str] = None,
+                        url_contains: Optional[str] = None, fields: Optional[str] = 'id,url,text,etag',
+                        limit: Optional[int] = None) -> Iterator[List[Dict]]:
+        """
+        Iterate over pages of an asset's links, fetching each page only when needed
+        
+        Handles both a plain JSON array (one page) and {"items": [...], "next": cursor}.
+        Each page request sends If-None-Match, so an unchanged page comes back as an empty 304.
+        
+        Args:
+            asset_id: Draftr asset ID
+            text, url, url_contains, fields: As for get_asset_links
+            limit: Links per page (default: LINKS_PAGE_SIZE)
+            
+        Yields:
+            Lists of links
+        """
+        params = {'text': text, 'url': url, 'url_contains': url_contains, 'fields': fields,
+                  'limit': limit or self.LINKS_PAGE_SIZE}
+        params = {k: v for k, v in params.items() if v is not None}
+        endpoint = f"{self.base_url}/assets/{asset_id}/links"
+        
+        while True:
+            page = self._get_links_page(endpoint, params)
+            if isinstance(page, list):
+                yield page
+                return
+            yield page.get('items', [])
+            if not page.get('next'):
+                return
+            params = {**params, 'cursor': page['next']}
+    
+    def _get_links_page(self, endpoint: str, params: Dict) -> Union[List[Dict], Dict]:
+        """GET one listing page, revalidating a previously seen copy with its ETag"""
+        cache_key = (self._cache_scope, endpoint, tuple(sorted(params.items())))
+        cached = _LINKS_ETAG_CACHE.get(cache_key)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        
+        response = self.session.get(endpoint, params=params, headers=headers)
+        if cached and response.status_code == 304:
+            return cached[1]
         response.raise_for_status()
-        return response.json()
+        page = _json(response)
+        
+        etag = response.headers.get('ETag')
+        if etag:
+            if cache_key not in _LINKS_ETAG_CACHE and len(_LINKS_ETAG_CACHE) >= LINKS_ETAG_CACHE_LIMIT:
+                _LINKS_ETAG_CACHE.pop(next(iter(_LINKS_ETAG_CACHE)), None)
+            _LINKS_ETAG_CACHE[cache_key] = (etag, page)
+        return page
+    
+    def iter_asset_links(self, asset_id: str, fields: Optional[str] = 'id,url,text,etag') -> Iterator[Dict]:
+        """
+        Iterate over all links in an asset as the response downloads
+        
+        With ijson installed each page is parsed incrementally, so memory stays
+        flat on large assets; otherwise this walks iter_link_pages().
+        
+        Args:
+            asset_id: Draftr asset ID
+            fields: Comma-separated link fields to return (None for all)
+            
+        Yields:
+            Links with their IDs, URLs, and text
+        """
+        if ijson is None:
+            for page in self.iter_link_pages(asset_id, fields=fields):
+                yield from page
+            return
+        
+        endpoint = f"{self.base_url}/assets/{asset_id}/links"
+        params = {'fields': fields, 'limit': self.LINKS_PAGE_SIZE} if fields else {'limit': self.LINKS_PAGE_SIZE}
+        while True:
+            cursor = {}
+            
+            def record_cursor(events):
+                for event in events:
+                    if event[0] == 'next' and event[1] in ('string', 'null'):
+                        cursor['next'] = event[2]
+                    yield event
+            
+            with self.session.get(endpoint, params=params, stream=True) as response:
+                response.raise_for_status()
+                # Let urllib3 undo gzip/deflate before ijson sees the bytes
+                response.raw.decode_content = True
+                events = ijson.parse(response.raw)
+                first = next(events, None)
+                if first is None:
+                    return
+                if first[1] == 'start_array':
+                    yield from ijson.items(itertools.chain([first], events), 'item')
+                    return
+                yield from ijson.items(record_cursor(itertools.chain([first], events)), 'items.item')
+            
+            if not cursor.get('next'):
+                return
+            params = {**params, 'cursor': cursor['next']}
     
-    def update_link(self, asset_id: str, link_id: str, new_url: str) -> Dict:
+    def update_link(self, asset_id: str, link_id: str, new_url: str, etag: Optional[str] = None) -> Dict:
         """
         Update a specific link in an asset
         
@@ -77,15 +270,84 @@ class DraftrAPIClient:
             asset_id: Draftr asset ID
             link_id: ID of the link to update
             new_url: New URL for the link
+            etag: Link version from the listing; sent as If-Match so newer edits are not overwritten
             
         Returns:
             Updated link data
         """
         url = f"{self.base_url}/assets/{asset_id}/links/{link_id}"
         data = {"url": new_url}
-        response = self.session.patch(url, json=data)
+        response = self._send_json('PATCH', url, data, {'If-Match': etag} if etag else None)
+        if response.status_code == 412:
+            # Link changed since it was listed; re-read it and retry once against that version
+            current = self.session.get(url)
+            current.raise_for_status()
+            link = _json(current)
+            if link.get('url') == new_url:
+                return link
+            etag = link.get('etag') or current.headers.get('ETag')
+            response = self._send_json('PATCH', url, data, {'If-Match': etag} if etag else None)
         response.raise_for_status()
-        return response.json()
+        self._links_index_cache.pop(asset_id, None)
+        return _json(response)
+    
+    def update_links(self, asset_id: str, updates: List[Tuple]) -> List[Dict]:
+        """
+        Update several links concurrently
+        
+        Args:
+            asset_id: Draftr asset ID
+            updates: (link_id, new_url) or (link_id, new_url, etag) tuples
+            
+        Returns:
+            Updated link data, in the same order as updates
+        """
+        if len(updates) <= 1:
+            return [self.update_link(asset_id, *update) for update in updates]
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(updates))) as pool:
+            return list(pool.map(lambda update: self.update_link(asset_id, *update), updates))
+    
+    def _link_text_index(self, asset_id: str, links: List[Dict]) -> Dict[str, Dict]:
+        """Text -> link lookup for a listing, rebuilt only when the listing object changes"""
+        cached = self._links_index_cache.get(asset_id)
+        if cached and cached[0] is links:
+            return cached[1]
+        
+        index = {}
+        for link in links:
+            index.setdefault(link.get('text', '').casefold(), link)
+        self._links_index_cache[asset_id] = (links, index)
+        return index
+    
+    def bulk_update_links(self, asset_id: str, updates: List[Dict]) -> List[Dict]:
+        """
+        Update several links in one request
+        
+        Falls back to concurrent per-link PATCHes if the server rejects the bulk
+        endpoint itself (405/501). A 404 means the asset is missing and is raised.
+        
+        Args:
+            asset_id: Draftr asset ID
+            updates: {"id": link_id, "url": new_url} dicts, with "etag" when known
+            
+        Returns:
+            Updated link data
+        """
+        if not updates:
+            return []
+        
+        if self._bulk_supported:
+            url = f"{self.base_url}/assets/{asset_id}/links/bulk"
+            response = self._send_json('POST', url, {"updates": updates})
+            # Only a method-level rejection turns bulk off; the client is shared process-wide
+            if response.status_code not in (405, 501):
+                response.raise_for_status()
+                self._links_index_cache.pop(asset_id, None)
+                return _json(response)
+            self._bulk_supported = False
+        
+        return self.update_links(asset_id, [(update['id'], update['url'], update.get('etag')) for update in updates])
     
     def find_and_update_link(self, asset_id: str, link_text: str, new_url: str) -> Dict:
         """
@@ -99,15 +361,26 @@ class DraftrAPIClient:
         Returns:
             Result with updated link info
         """
-        # Get all links
-        links = self.get_asset_links(asset_id)
+        key = link_text.casefold()
         
-        # Find link by text
-        target_link = None
-        for link in links:
-            if link.get('text', '').lower() == link_text.lower():
-                target_link = link
-                break
+        def find(links):
+            return self._link_text_index(asset_id, links).get(key)
+        
+        def first_match(pages, seen):
+            # Stop at the page holding the link; later pages are never fetched
+            for page in pages:
+                seen.extend(page)
+                link = find(page)
+                if link:
+                    return link
+            return None
+        
+        # Ask the server for matching links only
+        links = []
+        target_link = first_match(self.iter_link_pages(asset_id, text=link_text), [])
+        if not target_link:
+            # Server match may be case-sensitive; the full list also feeds the error below
+            target_link = first_match(self.iter_link_pages(asset_id), links)
         
         if not target_link:
             return {
@@ -117,7 +390,7 @@ class DraftrAPIClient:
             }
         
         # Update the link
-        updated = self.update_link(asset_id, target_link['id'], new_url)
+        updated = self.update_link(asset_id, target_link['id'], new_url, target_link.get('etag'))
         
         return {
             'success': True,
@@ -140,26 +413,9 @@ class DraftrAPIClient:
         Returns:
             Result with count of updated links
         """
-        links = self.get_asset_links(asset_id)
-        updated_count = 0
-        updated_links = []
-        
-        for link in links:
-            if link.get('url') == old_url:
-                updated = self.update_link(asset_id, link['id'], new_url)
-                updated_count += 1
-                updated_links.append({
-                    'id': link['id'],
-                    'text': link.get('text'),
-                    'old_url': old_url,
-                    'new_url': new_url
-                })
-        
-        return {
-            'success': True,
-            'updated_count': updated_count,
-            'updated_links': updated_links
-        }
+        links = self.get_asset_links(asset_id, url=old_url)
+        return self._apply_link_changes(
+            asset_id, ((link, new_url) for link in links if link.get('url') == old_url))
     
     def replace_domain(self, asset_id: str, old_domain: str, new_domain: str) -> Dict:
         """
@@ -173,32 +429,94 @@ class DraftrAPIClient:
         Returns:
             Result with count of updated links
         """
-        links = self.get_asset_links(asset_id)
-        updated_count = 0
+        links = self.get_asset_links(asset_id, url_contains=old_domain)
+        return self._apply_link_changes(
+            asset_id, ((link, link.get('url', '').replace(old_domain, new_domain))
+                       for link in links if old_domain in link.get('url', '')))
+    
+    def replace_domains(self, asset_id: str, mapping: Dict[str, str]) -> Dict:
+        """
+        Replace several domains in all links with one scan per URL
+        
+        Each occurrence is replaced once, so a new domain is never rewritten
+        again by another entry (e.g. {'/en/': '/uk/', '/uk/': '/en/'} swaps them).
+        A single entry goes through replace_domain, where str.replace beats a regex.
+        
+        Args:
+            asset_id: Draftr asset ID
+            mapping: Old domain -> new domain (e.g., {'/en/': '/uk/', '/fr/': '/be/'})
+            
+        Returns:
+            Result with count of updated links
+        """
+        if len(mapping) == 1:
+            (old_domain, new_domain), = mapping.items()
+            return self.replace_domain(asset_id, old_domain, new_domain)
+        
+        def changes():
+            pattern = _domains_pattern(tuple(mapping))
+            for link in self.iter_asset_links(asset_id):
+                new_url, count = pattern.subn(lambda m: mapping[m.group(0)], link.get('url', ''))
+                if count:
+                    yield link, new_url
+        
+        return self._apply_link_changes(asset_id, changes() if mapping else ())
+    
+    def _apply_link_changes(self, asset_id: str, changes: Iterable[Tuple[Dict, str]]) -> Dict:
+        """
+        Send the URL changes that are not already in place and build the result
+        
+        Args:
+            asset_id: Draftr asset ID
+            changes: (link, new_url) pairs for the matching links
+            
+        Returns:
+            Result with counts of updated and skipped (already up to date or repeated) links
+        """
+        updates = []
         updated_links = []
+        pending_ids = set()
+        skipped = 0
         
-        for link in links:
-            url = link.get('url', '')
-            if old_domain in url:
-                new_url = url.replace(old_domain, new_domain)
-                updated = self.update_link(asset_id, link['id'], new_url)
-                updated_count += 1
-                updated_links.append({
-                    'id': link['id'],
-                    'text': link.get('text'),
-                    'old_url': url,
-                    'new_url': new_url
-                })
+        for link, new_url in changes:
+            if link.get('url') == new_url or link['id'] in pending_ids:
+                skipped += 1
+                continue
+            pending_ids.add(link['id'])
+            update = {'id': link['id'], 'url': new_url}
+            if link.get('etag'):
+                update['etag'] = link['etag']
+            updates.append(update)
+            updated_links.append({
+                'id': link['id'],
+                'text': link.get('text'),
+                'old_url': link.get('url'),
+                'new_url': new_url
+            })
+        
+        self.bulk_update_links(asset_id, updates)
         
         return {
             'success': True,
-            'updated_count': updated_count,
+            'updated_count': len(updated_links),
+            'skipped': skipped,
             'updated_links': updated_links
         }
 
 
 # Example usage functions for Streamlit integration
 
+@st.cache_resource(show_spinner=False)
+def _get_client() -> DraftrAPIClient:
+    """
+    Shared Draftr client built from Streamlit secrets
+    
+    One instance per process, so its session keeps connections warm across reruns.
+    Raises ValueError (not cached) when DRAFTR_API_KEY is missing.
+    """
+    return DraftrAPIClient()
+
+
 def draftr_api_update_link(asset_id: str, link_text: str, new_url: str) -> Dict:
     """
     Streamlit-friendly function to update a Draftr link via API
@@ -212,7 +530,7 @@ def draftr_api_update_link(asset_id: str, link_text: str, new_url: str) -> Dict:
         Result dictionary with success status and details
     """
     try:
-        client = DraftrAPIClient()
+        client = _get_client()
         result = client.find_and_update_link(asset_id, link_text, new_url)
         return result
     except requests.HTTPError as e:
@@ -240,7 +558,7 @@ def draftr_api_bulk_replace(asset_id: str, old_url: str, new_url: str) -> Dict:
         Result dictionary with success status and count
     """
     try:
-        client = DraftrAPIClient()
+        client = _get_client()
         result = client.bulk_replace_links(asset_id, old_url, new_url)
         return result
     except Exception as e:
@@ -263,7 +581,7 @@ def draftr_api_replace_domain(asset_id: str, old_domain: str, new_domain: str) -
         Result dictionary with success status and count
     """
     try:
-        client = DraftrAPIClient()
+        client = _get_client()
         result = client.replace_domain(asset_id, old_domain, new_domain)
         return result
     except Exception as e:
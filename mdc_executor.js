@@ -9,6 +9,8 @@
 import { spawn } from 'child_process';
 import fs from 'fs';
 import path from 'path';
+import readline from 'readline';
+import util from 'util';
 import { fileURLToPath } from 'url';
 import { Client } from '@modelcontextprotocol/sdk/client/index.js';
 import { StdioClientTransport } from '@modelcontextprotocol/sdk/client/stdio.js';
@@ -611,12 +613,81 @@ class MDCExecutor {
     }
 }
 
+function printSummary(result) {
+    console.log('\n' + '='.repeat(60));
+    if (result.success) {
+        console.log('✅ AUTOMATION COMPLETED SUCCESSFULLY');
+        console.log('='.repeat(60));
+        console.log(`Total commands: ${result.total_commands || 0}`);
+        console.log(`Successful: ${result.successful || 0}`);
+        console.log(`Failed: ${result.failed || 0}`);
+        console.log(`Duration: ${result.total_duration_ms || 0}ms`);
+        console.log(`Timestamp: ${result.timestamp || 'N/A'}`);
+    } else {
+        console.log('❌ AUTOMATION FAILED');
+        console.log('='.repeat(60));
+        console.log(`Total commands: ${result.total_commands || 0}`);
+        console.log(`Successful: ${result.successful || 0}`);
+        console.log(`Failed: ${result.failed || 0}`);
+        if (result.error) {
+            console.error(`Error: ${result.error}`);
+        }
+    }
+    console.log('='.repeat(60) + '\n');
+}
+
+// Long-lived worker: one JSON request per stdin line, one JSON response per stdout line.
+// Request:  {"mdc": "<path>", "context": {...}}
+// Response: {"returncode": 0|1, "stdout": "...", "stderr": "..."}
+async function serve() {
+    const executor = new MDCExecutor();
+    const protocolOut = process.stdout.write.bind(process.stdout);
+    
+    // Console output is collected per request so stdout only carries protocol lines
+    let out = [];
+    let err = [];
+    console.log = console.info = (...a) => { out.push(util.format(...a)); };
+    console.warn = console.error = (...a) => { err.push(util.format(...a)); };
+    
+    const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    for await (const line of rl) {
+        if (!line.trim()) continue;
+        out = [];
+        err = [];
+        let result = { success: false };
+        try {
+            const request = JSON.parse(line);
+            if (!fs.existsSync(request.mdc)) {
+                console.error(`MDC file not found: ${request.mdc}`);
+            } else {
+                if (request.context && Object.keys(request.context).length > 0) {
+                    console.log('[MDC Executor] Context:', JSON.stringify(request.context, null, 2));
+                }
+                result = await executor.executeMDC(request.mdc, request.context || {});
+                printSummary(result);
+            }
+        } catch (e) {
+            console.error('Fatal error:', e);
+        }
+        protocolOut(JSON.stringify({
+            returncode: result.success ? 0 : 1,
+            stdout: out.length ? out.join('\n') + '\n' : '',
+            stderr: err.length ? err.join('\n') + '\n' : ''
+        }) + '\n');
+    }
+}
+
 // CLI entry point
 async function main() {
     const args = process.argv.slice(2);
     
+    if (args[0] === '--serve') {
+        return serve();
+    }
+    
     if (args.length === 0) {
-        console.error('Usage: node mdc_executor.js <mdc-file-path> [--context <json>]');
+        console.error('Usage: node mdc_executor.js <mdc-file-path> [--context <json> | --context-stdin | --context-file <path>]');
+        console.error('       node mdc_executor.js --serve   (read JSON requests from stdin, one per line)');
         console.error('');
         console.error('Example:');
         console.error('  node mdc_executor.js automation.mdc');
@@ -629,11 +700,30 @@ async function main() {
     const mdcFilePath = args[0];
     let context = {};
     
-    // Parse context if provided
+    // Parse context if provided (inline JSON, or stdin / a file for payloads too large for argv)
     const contextIndex = args.indexOf('--context');
+    const contextFileIndex = args.indexOf('--context-file');
+    let contextJson = null;
     if (contextIndex !== -1 && args[contextIndex + 1]) {
+        contextJson = args[contextIndex + 1];
+    } else if (args.includes('--context-stdin')) {
+        try {
+            contextJson = fs.readFileSync(0, 'utf8');
+        } catch (e) {
+            console.error('Failed to read context from stdin:', e.message);
+            process.exit(1);
+        }
+    } else if (contextFileIndex !== -1 && args[contextFileIndex + 1]) {
+        try {
+            contextJson = fs.readFileSync(args[contextFileIndex + 1], 'utf8');
+        } catch (e) {
+            console.error('Failed to read context file:', e.message);
+            process.exit(1);
+        }
+    }
+    if (contextJson !== null) {
         try {
-            context = JSON.parse(args[contextIndex + 1]);
+            context = JSON.parse(contextJson);
             console.log('[MDC Executor] Context:', JSON.stringify(context, null, 2));
         } catch (e) {
             console.error('Failed to parse context JSON:', e.message);
@@ -652,26 +742,7 @@ async function main() {
     const result = await executor.executeMDC(mdcFilePath, context);
     
     // Print final summary
-    console.log('\n' + '='.repeat(60));
-    if (result.success) {
-        console.log('✅ AUTOMATION COMPLETED SUCCESSFULLY');
-        console.log('='.repeat(60));
-        console.log(`Total commands: ${result.total_commands || 0}`);
-        console.log(`Successful: ${result.successful || 0}`);
-        console.log(`Failed: ${result.failed || 0}`);
-        console.log(`Duration: ${result.total_duration_ms || 0}ms`);
-        console.log(`Timestamp: ${result.timestamp || 'N/A'}`);
-    } else {
-        console.log('❌ AUTOMATION FAILED');
-        console.log('='.repeat(60));
-        console.log(`Total commands: ${result.total_commands || 0}`);
-        console.log(`Successful: ${result.successful || 0}`);
-        console.log(`Failed: ${result.failed || 0}`);
-        if (result.error) {
-            console.error(`Error: ${result.error}`);
-        }
-    }
-    console.log('='.repeat(60) + '\n');
+    printSummary(result);
     
     // Exit with appropriate code
     process.exit(result.success ? 0 : 1);